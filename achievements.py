@@ -0,0 +1,41 @@
+import bisect
+from collections import namedtuple
+
+# ``counter`` names a per-user count kept by the check-in path ("all",
+# "week" or "month" check-ins); the badge unlocks once it reaches ``threshold``.
+Achievement = namedtuple("Achievement", "key name description counter threshold")
+
+ACHIEVEMENTS = (
+    Achievement("first_checkin", "First Steps", "Checked in to your first event", "all", 1),
+    Achievement("regular", "Regular", "Attended 5 events", "all", 5),
+    Achievement("event_champion", "Event Champion", "Attended 10+ events", "all", 10),
+    Achievement("veteran", "Veteran", "Attended 50+ events", "all", 50),
+    Achievement("busy_week", "Busy Week", "Attended 3 events in one week", "week", 3),
+    Achievement("monthly_marathon", "Monthly Marathon", "Attended 8 events in one month", "month", 8),
+)
+
+
+class AchievementRules:
+    """Index of achievement rules by counter and threshold.
+
+    ``crossed`` only looks at the rules whose threshold lies between a
+    counter's old and new value, so evaluating a check-in never depends on
+    the user's history or on how many other rules exist.
+    """
+
+    def __init__(self, achievements=ACHIEVEMENTS):
+        self.by_key = {achievement.key: achievement for achievement in achievements}
+        self._thresholds = {}
+        self._rules = {}
+        for achievement in sorted(achievements, key=lambda a: a.threshold):
+            self._thresholds.setdefault(achievement.counter, []).append(achievement.threshold)
+            self._rules.setdefault(achievement.counter, []).append(achievement)
+
+    def crossed(self, counter, old, new):
+        """Achievements unlocked by ``counter`` moving from ``old`` to ``new``."""
+        thresholds = self._thresholds.get(counter)
+        if not thresholds or new <= old:
+            return []
+        start = bisect.bisect_right(thresholds, old)
+        end = bisect.bisect_right(thresholds, new)
+        return self._rules[counter][start:end]
@@ -0,0 +1,163 @@
+"""Load-test the check-in hot path end to end.
+
+Seeds ``--users`` users and ``--events`` events, starts gunicorn with
+gunicorn.conf.py, then drives each scenario in turn at ``--concurrency``
+and reports throughput and p50/p95/p99 latency as JSON:
+
+* ``login``      POST /login, cycling through the seeded users
+* ``checkin``    POST /checkin, one user/event pair per request
+* ``attendees``  GET /event_attendees/<id>
+* ``events``     GET /events
+* ``qr``         GET /generate_qr/<id>
+
+Without ``--database-url`` a throwaway SQLite file is used. Pointing it at
+Postgres gives representative numbers; ``--reset`` is then required because
+the tables are dropped and recreated. Login rate limits are disabled for
+the server under test.
+
+Usage: python benchmarks/checkin_load.py [--users 1000] [--events 50]
+       [--requests 2000] [--concurrency 32] [--workers 2]
+       [--scenarios login,checkin,attendees,events,qr]
+       [--database-url URL --reset] [--output results.json]
+"""
+import argparse
+import json
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from loadgen import git_revision, run_load, wait_for_server
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCENARIOS = ("login", "checkin", "attendees", "events", "qr")
+PASSWORD = "benchmark-password"
+
+
+def seed(args):
+    """Create the schema and bulk-insert users and events; returns ``(event_ids, tokens by user id)``."""
+    sys.path.insert(0, ROOT)
+    from flask_jwt_extended import create_access_token
+
+    from app import app
+    from extensions import db, password_hasher
+    from models import Event, User
+
+    with app.app_context():
+        if args.reset:
+            db.drop_all(bind_key=None)
+        db.create_all(bind_key=None)
+        if db.session.query(User.id).first() is not None:
+            raise SystemExit("Database already has users; pass --reset to drop and recreate the tables")
+
+        password_hash = password_hasher.hash(PASSWORD)
+        db.session.execute(db.insert(User), [
+            {"username": f"bench{i}", "email": f"bench{i}@example.com", "password_hash": password_hash}
+            for i in range(args.users)
+        ])
+        start = datetime(2025, 1, 1)
+        db.session.execute(db.insert(Event), [
+            {"name": f"Benchmark event {i}", "date": start + timedelta(hours=i), "updated_at": start}
+            for i in range(args.events)
+        ])
+        db.session.commit()
+
+        user_ids = [row.id for row in db.session.query(User.id).order_by(User.id)]
+        event_ids = [row.id for row in db.session.query(Event.id).order_by(Event.id)]
+        tokens = [create_access_token(identity=str(user_id), expires_delta=timedelta(hours=1))
+                  for user_id in user_ids]
+    return event_ids, tokens
+
+
+def scenario_requests(name, event_ids, tokens):
+    users, events = len(tokens), len(event_ids)
+
+    def auth(i):
+        return {"Authorization": f"Bearer {tokens[i % users]}"}
+
+    if name == "login":
+        return lambda i: ("POST", "/login", {"username": f"bench{i % users}", "password": PASSWORD}, None)
+    if name == "checkin":
+        # Walk users first, then events, so requests only repeat a pair after users * events.
+        return lambda i: ("POST", "/checkin", {"event_id": event_ids[(i // users) % events]}, auth(i))
+    if name == "attendees":
+        return lambda i: ("GET", f"/event_attendees/{event_ids[i % events]}", None, None)
+    if name == "events":
+        return lambda i: ("GET", "/events", None, None)
+    if name == "qr":
+        return lambda i: ("GET", f"/generate_qr/{event_ids[i % events]}", None, None)
+    raise ValueError(f"Unknown scenario: {name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--events", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=2000, help="requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--worker-class", default=os.getenv("GUNICORN_WORKER_CLASS", "sync"))
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--database-url", help="defaults to a temporary SQLite file")
+    parser.add_argument("--reset", action="store_true", help="drop and recreate tables first")
+    parser.add_argument("--port", type=int, default=5056)
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    args = parser.parse_args()
+
+    scenarios = args.scenarios.split(",")
+    for name in scenarios:
+        if name not in SCENARIOS:
+            parser.error(f"unknown scenario {name!r}; choose from {', '.join(SCENARIOS)}")
+
+    tmpdir = None
+    if not args.database_url:
+        tmpdir = tempfile.TemporaryDirectory()
+        args.database_url = f"sqlite:///{os.path.join(tmpdir.name, 'bench.db')}"
+    os.environ.update(DATABASE_URL=args.database_url, RATELIMIT_LOGIN_PER_IP="", RATELIMIT_LOGIN_PER_USER="")
+
+    event_ids, tokens = seed(args)
+
+    env = dict(os.environ, GUNICORN_WORKER_CLASS=args.worker_class, WEB_CONCURRENCY=str(args.workers),
+               GUNICORN_BIND=f"127.0.0.1:{args.port}", GUNICORN_LOGLEVEL="warning")
+    server = subprocess.Popen([sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "app:app"],
+                              cwd=ROOT, env=env)
+    base_url = f"http://127.0.0.1:{args.port}"
+    results = []
+    try:
+        if not wait_for_server(base_url):
+            raise RuntimeError("gunicorn did not start")
+        for name in scenarios:
+            result = run_load(name, base_url, scenario_requests(name, event_ids, tokens),
+                              args.requests, args.concurrency)
+            results.append(result.summary())
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait(timeout=30)
+        if tmpdir:
+            tmpdir.cleanup()
+
+    report = {
+        "revision": git_revision(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "database": args.database_url.split(":", 1)[0],
+        "users": args.users,
+        "events": args.events,
+        "requests_per_scenario": args.requests,
+        "concurrency": args.concurrency,
+        "workers": args.workers,
+        "worker_class": args.worker_class,
+        "results": results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
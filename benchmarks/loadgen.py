@@ -0,0 +1,116 @@
+"""Small concurrent HTTP load generator and helpers shared by the benchmark scripts."""
+import http.client
+import json
+import os
+import statistics
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def percentile(samples, pct):
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+class LoadResult:
+    def __init__(self, name, latencies, errors, elapsed):
+        self.name = name
+        self.latencies = latencies
+        self.errors = errors
+        self.elapsed = elapsed
+
+    def summary(self):
+        ms = [latency * 1000 for latency in self.latencies]
+        return {
+            "name": self.name,
+            "requests": len(self.latencies) + self.errors,
+            "errors": self.errors,
+            "throughput_rps": round(len(self.latencies) / self.elapsed, 2) if self.elapsed else None,
+            "p50_ms": round(percentile(ms, 50), 2) if ms else None,
+            "p95_ms": round(percentile(ms, 95), 2) if ms else None,
+            "p99_ms": round(percentile(ms, 99), 2) if ms else None,
+            "mean_ms": round(statistics.fmean(ms), 2) if ms else None,
+        }
+
+
+def wait_for_server(base_url, path="/events", timeout=30.0):
+    parts = urlsplit(base_url)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=2)
+            conn.request("GET", path)
+            conn.getresponse().read()
+            conn.close()
+            return True
+        except OSError:
+            time.sleep(0.2)
+    return False
+
+
+def run_load(name, base_url, make_request, requests, concurrency, ok_status=(200, 201, 304)):
+    """Issue ``requests`` calls across ``concurrency`` keep-alive connections.
+
+    ``make_request(i)`` returns ``(method, path, body_or_None, headers)``.
+    """
+    parts = urlsplit(base_url)
+    local = threading.local()
+    counter = iter(range(requests))
+    counter_lock = threading.Lock()
+    latencies, errors = [], [0]
+    results_lock = threading.Lock()
+
+    def connection():
+        if getattr(local, "conn", None) is None:
+            local.conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=30)
+        return local.conn
+
+    def worker():
+        while True:
+            with counter_lock:
+                index = next(counter, None)
+            if index is None:
+                return
+            method, path, body, headers = make_request(index)
+            headers = dict(headers or {})
+            if body is not None:
+                body = json.dumps(body)
+                headers["Content-Type"] = "application/json"
+            start = time.perf_counter()
+            try:
+                conn = connection()
+                conn.request(method, path, body=body, headers=headers)
+                response = conn.getresponse()
+                response.read()
+                ok = response.status in ok_status
+            except (OSError, http.client.HTTPException):
+                local.conn = None
+                ok = False
+            elapsed = time.perf_counter() - start
+            with results_lock:
+                if ok:
+                    latencies.append(elapsed)
+                else:
+                    errors[0] += 1
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for _ in range(concurrency):
+            pool.submit(worker)
+    return LoadResult(name, latencies, errors[0], time.perf_counter() - start)
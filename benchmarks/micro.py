@@ -0,0 +1,173 @@
+"""Micro-benchmarks for the CPU-heavy paths: QR rendering and password hashing.
+
+Each case is timed in rounds until ``--max-time`` seconds have passed (but at
+least ``--min-rounds`` times), in the spirit of pytest-benchmark. Every run
+is appended as one JSON line to ``--history`` (ignored by git) along with
+the git revision and machine, and the median of each case is compared with
+the last run recorded on the same machine, so defaults can be chosen from
+data and regressions spotted between releases.
+
+QR cases cover payload length (which sets the QR version), box size, error
+correction and format. Hash cases cover scheme and cost, timed through
+passwords.PasswordHasher as the app uses it.
+
+Usage: python benchmarks/micro.py [--group qr|hash|all] [-k substring]
+       [--min-rounds 3] [--max-time 1.0] [--history FILE] [--no-record] [--json]
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from loadgen import git_revision  # noqa: E402
+from passwords import PasswordHasher  # noqa: E402
+from qr_render import build_qr, render  # noqa: E402
+
+DEFAULT_HISTORY = os.path.join(ROOT, "benchmarks", "micro_history.jsonl")
+
+PAYLOADS = {
+    "plain": "http://127.0.0.1:5000/checkin?event_id=12345",
+    "token": "http://127.0.0.1:5000/checkin?event_id=12345&token=12345.1792278600."
+             "htYrzLuvip3G-G_Zl1SmiTYV_RjY_1GBI1C7_vA4esw",
+    "long": "https://trakzone.example.com/checkin?event_id=12345&" + "x" * 200,
+}
+
+QR_CASES = [
+    {"payload": payload, "format": fmt, "box_size": box_size, "error_correction": ec}
+    for payload in PAYLOADS
+    for fmt in ("png", "svg")
+    for box_size in (4, 10, 20)
+    for ec in ("L", "M", "H")
+]
+
+HASH_CASES = [
+    {"scheme": "scrypt", "cost": 16384},
+    {"scheme": "scrypt", "cost": 32768},
+    {"scheme": "scrypt", "cost": 65536},
+    {"scheme": "pbkdf2", "cost": 260000},
+    {"scheme": "pbkdf2", "cost": 600000},
+    {"scheme": "pbkdf2", "cost": 1000000},
+    {"scheme": "bcrypt", "cost": 10},
+    {"scheme": "bcrypt", "cost": 12},
+    {"scheme": "bcrypt", "cost": 13},
+]
+
+
+def measure(func, min_rounds, max_time):
+    timings = []
+    deadline = time.perf_counter() + max_time
+    while len(timings) < min_rounds or time.perf_counter() < deadline:
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    ms = [t * 1000 for t in timings]
+    return {
+        "rounds": len(ms),
+        "min_ms": round(min(ms), 4),
+        "median_ms": round(statistics.median(ms), 4),
+        "mean_ms": round(statistics.fmean(ms), 4),
+        "stddev_ms": round(statistics.stdev(ms), 4) if len(ms) > 1 else 0.0,
+    }
+
+
+def case_name(group, params):
+    return group + "[" + ",".join(f"{key}={value}" for key, value in params.items()) + "]"
+
+
+def bench_qr(params, args):
+    payload = PAYLOADS[params["payload"]]
+    options = {key: value for key, value in params.items() if key != "payload"}
+    stats = measure(lambda: render(payload, **options), args.min_rounds, args.max_time)
+    return dict(stats, version=build_qr(payload, error_correction=params["error_correction"]).version,
+                bytes=len(render(payload, **options)))
+
+
+def bench_hash(params, args):
+    hasher = PasswordHasher(scheme=params["scheme"], cost=params["cost"])
+    password_hash = hasher.hash("benchmark-password")
+    stats = measure(lambda: hasher.hash("benchmark-password"), args.min_rounds, args.max_time)
+    verify = measure(lambda: hasher.verify(password_hash, "benchmark-password"), args.min_rounds, args.max_time)
+    return dict(stats, verify_median_ms=verify["median_ms"])
+
+
+def machine():
+    return {"node": platform.node(), "machine": platform.machine(), "processor": platform.processor(),
+            "cpus": os.cpu_count(), "python": platform.python_version()}
+
+
+def previous_medians(history, current_machine):
+    """Median per case name from the last recorded run on this machine."""
+    if not os.path.exists(history):
+        return {}
+    last = None
+    with open(history) as f:
+        for line in f:
+            try:
+                run = json.loads(line)
+            except ValueError:
+                continue
+            if run.get("machine") == current_machine:
+                last = run
+    if last is None:
+        return {}
+    return {result["name"]: result["median_ms"] for result in last["results"]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--group", choices=("qr", "hash", "all"), default="all")
+    parser.add_argument("-k", dest="keyword", help="only run cases whose name contains this")
+    parser.add_argument("--min-rounds", type=int, default=3)
+    parser.add_argument("--max-time", type=float, default=1.0, help="seconds per case")
+    parser.add_argument("--history", default=DEFAULT_HISTORY)
+    parser.add_argument("--no-record", action="store_true", help="do not append this run to the history")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    cases = []
+    if args.group in ("qr", "all"):
+        cases += [("qr", params, bench_qr) for params in QR_CASES]
+    if args.group in ("hash", "all"):
+        cases += [("hash", params, bench_hash) for params in HASH_CASES]
+
+    results = []
+    for group, params, bench in cases:
+        name = case_name(group, params)
+        if args.keyword and args.keyword not in name:
+            continue
+        results.append(dict(name=name, group=group, params=params, **bench(params, args)))
+
+    current_machine = machine()
+    previous = previous_medians(args.history, current_machine)
+    for result in results:
+        before = previous.get(result["name"])
+        result["change_pct"] = round((result["median_ms"] / before - 1) * 100, 1) if before else None
+
+    run = {
+        "revision": git_revision(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "machine": current_machine,
+        "results": results,
+    }
+    if not args.no_record:
+        with open(args.history, "a") as f:
+            f.write(json.dumps(run) + "\n")
+
+    if args.json:
+        print(json.dumps(run, indent=2))
+        return
+
+    print(f"{'case':<58} {'median ms':>10} {'min ms':>9} {'rounds':>7} {'vs last':>8}")
+    for r in results:
+        change = f"{r['change_pct']:+.1f}%" if r["change_pct"] is not None else "-"
+        print(f"{r['name']:<58} {r['median_ms']:>10.3f} {r['min_ms']:>9.3f} {r['rounds']:>7} {change:>8}")
+
+
+if __name__ == "__main__":
+    main()
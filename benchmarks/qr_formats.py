@@ -0,0 +1,60 @@
+"""Compare QR render time and bytes-on-wire for PNG and SVG output.
+
+Usage: python benchmarks/qr_formats.py [--iterations N] [--json]
+"""
+import argparse
+import gzip
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from qr_render import render  # noqa: E402
+
+PAYLOAD = "http://127.0.0.1:5000/checkin?event_id=12345"
+
+CASES = [
+    {"format": "png", "box_size": 10, "border": 4, "error_correction": "M"},
+    {"format": "svg", "box_size": 10, "border": 4, "error_correction": "M"},
+    {"format": "png", "box_size": 40, "border": 4, "error_correction": "H"},
+    {"format": "svg", "box_size": 40, "border": 4, "error_correction": "H"},
+]
+
+
+def bench(options, iterations):
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        data = render(PAYLOAD, **options)
+        timings.append(time.perf_counter() - start)
+    return {
+        **options,
+        "bytes": len(data),
+        "bytes_gzip": len(gzip.compress(data)),
+        "render_ms_median": statistics.median(timings) * 1000,
+        "render_ms_min": min(timings) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    results = [bench(options, args.iterations) for options in CASES]
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'format':<6} {'box':>4} {'ec':>2} {'bytes':>8} {'gzip':>8} {'median ms':>10} {'min ms':>8}")
+    for r in results:
+        print(f"{r['format']:<6} {r['box_size']:>4} {r['error_correction']:>2} {r['bytes']:>8} "
+              f"{r['bytes_gzip']:>8} {r['render_ms_median']:>10.2f} {r['render_ms_min']:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Measure how long a fresh worker takes to import the app.
+
+Each round starts a new interpreter that runs ``import app`` (or --module),
+which is what every gunicorn worker pays without --preload and what an
+autoscaled instance pays before serving its first request. The median wall
+time is reported along with the slowest imports by cumulative time, taken
+from ``python -X importtime``, so heavy dependencies creeping back into the
+import path are easy to spot.
+
+Usage: python benchmarks/startup.py [--rounds 10] [--module app] [--top 15] [--json]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_once(module):
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", f"import {module}"], cwd=ROOT, check=True)
+    return time.perf_counter() - start
+
+
+def slowest_imports(module, top):
+    """Top imports by cumulative microseconds, from ``-X importtime``."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if name.strip() != module:
+            imports.append({"module": name.strip(), "cumulative_ms": round(int(cumulative) / 1000, 1)})
+    return sorted(imports, key=lambda entry: entry["cumulative_ms"], reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--module", default="app")
+    parser.add_argument("--top", type=int, default=15, help="number of slowest imports to list")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    baseline = [import_once("flask") for _ in range(args.rounds)]
+    timings = [import_once(args.module) for _ in range(args.rounds)]
+    result = {
+        "module": args.module,
+        "rounds": args.rounds,
+        "median_ms": round(statistics.median(timings) * 1000, 1),
+        "min_ms": round(min(timings) * 1000, 1),
+        "flask_only_median_ms": round(statistics.median(baseline) * 1000, 1),
+        "slowest_imports": slowest_imports(args.module, args.top),
+    }
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+
+    print(f"import {args.module}: median {result['median_ms']} ms, min {result['min_ms']} ms "
+          f"over {args.rounds} rounds (bare flask: {result['flask_only_median_ms']} ms)")
+    print(f"\n{'module':<40} {'cumulative ms':>14}")
+    for entry in result["slowest_imports"]:
+        print(f"{entry['module']:<40} {entry['cumulative_ms']:>14}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Compare gunicorn worker classes under the same concurrent read load.
+
+Starts gunicorn once per worker class with gunicorn.conf.py, drives
+GET /events (or --path) and prints throughput and latency percentiles.
+The gap between sync and gevent workers comes from time spent waiting on
+the database, so point DATABASE_URL at a real Postgres for representative
+numbers.
+
+Usage: python benchmarks/worker_modes.py [--modes sync,gthread,gevent]
+       [--workers 2] [--requests 2000] [--concurrency 64] [--json]
+"""
+import argparse
+import json
+import os
+import signal
+import subprocess
+import sys
+
+from loadgen import run_load, wait_for_server
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def bench_mode(mode, args):
+    env = dict(os.environ, GUNICORN_WORKER_CLASS=mode, WEB_CONCURRENCY=str(args.workers),
+               GUNICORN_BIND=f"127.0.0.1:{args.port}", GUNICORN_LOGLEVEL="warning")
+    server = subprocess.Popen([sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "app:app"],
+                              cwd=ROOT, env=env)
+    base_url = f"http://127.0.0.1:{args.port}"
+    try:
+        if not wait_for_server(base_url, args.path):
+            raise RuntimeError(f"gunicorn ({mode}) did not start")
+        result = run_load(mode, base_url, lambda i: ("GET", args.path, None, None),
+                          args.requests, args.concurrency)
+        return result.summary()
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait(timeout=30)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--modes", default="sync,gthread,gevent")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--path", default="/events")
+    parser.add_argument("--port", type=int, default=5055)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    results = [bench_mode(mode, args) for mode in args.modes.split(",")]
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'mode':<8} {'rps':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for r in results:
+        print(f"{r['name']:<8} {r['throughput_rps']:>9} {r['p50_ms']:>8} {r['p95_ms']:>8} "
+              f"{r['p99_ms']:>8} {r['errors']:>7}")
+
+
+if __name__ == "__main__":
+    main()
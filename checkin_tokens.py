@@ -0,0 +1,39 @@
+import hashlib
+import time
+
+from itsdangerous import BadSignature, Signer
+
+
+class CheckinTokens:
+    """Signed, expiring per-event check-in tokens.
+
+    A token is ``<event_id>.<expires>.<signature>``. Expiry is rounded to
+    ``ttl``-second windows, so every token issued for an event within one
+    window is identical (and a QR image built from it stays cacheable) and
+    stays valid for between ``ttl`` and ``2 * ttl`` seconds.
+    """
+
+    def __init__(self, secret, ttl):
+        self.ttl = ttl
+        self._signer = Signer(secret, salt="trakzone-checkin", digest_method=hashlib.sha256)
+
+    def issue(self, event_id, now=None):
+        window = int((time.time() if now is None else now) // self.ttl)
+        expires = (window + 2) * self.ttl
+        return self._signer.sign(f"{event_id}.{expires}").decode("ascii")
+
+    def seconds_until_rotation(self, now=None):
+        now = time.time() if now is None else now
+        return int(self.ttl - now % self.ttl)
+
+    def verify(self, token, now=None):
+        """Event id of a valid, unexpired token, else None."""
+        if not isinstance(token, str):
+            return None
+        try:
+            event_id, expires = self._signer.unsign(token).decode("ascii").split(".")
+        except (BadSignature, UnicodeDecodeError, ValueError):
+            return None
+        if int(expires) < (time.time() if now is None else now):
+            return None
+        return int(event_id)
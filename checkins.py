@@ -0,0 +1,190 @@
+"""Side effects of new check-ins, shared by the check-in, leaderboard, live and admin views.
+
+``record_checkins`` updates the derived tables inside the check-in
+transaction; ``checkins_committed`` pushes committed rows to the leaderboard
+store and the live feed.
+"""
+import json
+import logging
+import time
+from datetime import datetime, timedelta
+
+from flask import current_app
+
+from extensions import achievement_rules, db, leaderboard_store, live_broker, username_cache
+from models import (LeaderboardScore, User, UserAchievement, bump_metrics, conflict_insert,
+                    prune_metric_minutes)
+
+logger = logging.getLogger(__name__)
+
+# ================================
+# LEADERBOARD
+# ================================
+
+LEADERBOARD_PERIODS = ("all", "week", "month")
+
+def leaderboard_period_key(period, timestamp):
+    if period == "week":
+        year, week, _ = timestamp.isocalendar()
+        return f"week:{year}-W{week:02d}"
+    if period == "month":
+        return f"month:{timestamp:%Y-%m}"
+    return "all"
+
+def add_leaderboard_checkins(checkins):
+    """Increment per-period check-in counts with one upsert.
+
+    Returns ``[(user_id, counter, old, new)]`` where ``counter`` is the period
+    kind ("all", "week" or "month").
+    """
+    counts = {}
+    for user_id, _, timestamp in checkins:
+        for period in LEADERBOARD_PERIODS:
+            key = (leaderboard_period_key(period, timestamp), user_id)
+            counts[key] = counts.get(key, 0) + 1
+
+    stmt = conflict_insert(LeaderboardScore).values(
+        # Fixed row order so concurrent batches lock rows in the same order and can't deadlock.
+        [{"period": period, "user_id": user_id, "checkins": count}
+         for (period, user_id), count in sorted(counts.items())]
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=['period', 'user_id'],
+        set_={"checkins": LeaderboardScore.checkins + stmt.excluded.checkins},
+    ).returning(LeaderboardScore.period, LeaderboardScore.user_id, LeaderboardScore.checkins)
+
+    return [(user_id, period.split(":", 1)[0], new - counts[(period, user_id)], new)
+            for period, user_id, new in db.session.execute(stmt)]
+
+def lookup_usernames(user_ids):
+    def load(missing):
+        return dict(db.session.execute(db.select(User.id, User.username).where(User.id.in_(missing))).all())
+    return username_cache.get_many(user_ids, load)
+
+@db.event.listens_for(User, 'after_update')
+@db.event.listens_for(User, 'after_delete')
+def _invalidate_username(mapper, connection, target):
+    username_cache.invalidate(target.id)
+
+# ================================
+# ACHIEVEMENTS
+# ================================
+
+def unlock_achievements(counters):
+    """Persist achievements crossed by ``[(user_id, counter, old, new)]`` counter changes."""
+    unlocked = [{"user_id": user_id, "achievement": achievement.key, "unlocked_at": datetime.utcnow()}
+                for user_id, counter, old, new in counters
+                for achievement in achievement_rules.crossed(counter, old, new)]
+    if unlocked:
+        db.session.execute(conflict_insert(UserAchievement).values(unlocked).on_conflict_do_nothing())
+    return unlocked
+
+# ================================
+# ADMIN METRICS
+# ================================
+
+def metric_minutes_since():
+    """Oldest minute the dashboard shows; older minute counters are neither written nor kept."""
+    return datetime.utcnow() - timedelta(minutes=current_app.config['METRICS_RATE_MINUTES'])
+
+def checkin_metric_deltas(checkins, counters):
+    deltas = {("total", "checkins"): len(checkins)}
+    since = metric_minutes_since().strftime("%Y-%m-%d %H:%M")
+    for _, event_id, timestamp in checkins:
+        keys = [("event", str(event_id))]
+        minute = timestamp.strftime("%Y-%m-%d %H:%M")
+        # Late offline scans would only recreate minutes the sweep removes.
+        if minute >= since:
+            keys.append(("minute", minute))
+        for key in keys:
+            deltas[key] = deltas.get(key, 0) + 1
+    # A user's all-time count leaving zero means a new unique participant.
+    participants = sum(1 for _, counter, old, _ in counters if counter == "all" and old == 0)
+    if participants:
+        deltas[("total", "participants")] = participants
+    return deltas
+
+minutes_pruned_at = None
+
+def prune_metric_minutes_if_due():
+    """Sweep minute counters that left the dashboard window, at most once per interval per worker.
+
+    Runs after the check-in commits, in its own transaction, so check-ins
+    never wait on the DELETE.
+    """
+    global minutes_pruned_at
+    now = time.monotonic()
+    if minutes_pruned_at is not None and now - minutes_pruned_at < current_app.config['METRICS_PRUNE_INTERVAL']:
+        return
+    minutes_pruned_at = now
+    with db.engine.begin() as connection:
+        prune_metric_minutes(metric_minutes_since(), connection)
+
+# ================================
+# LIVE FEED
+# ================================
+
+def live_bridge_enabled():
+    mode = current_app.config['LIVE_FEED_BRIDGE']
+    if mode == "auto":
+        return db.engine.dialect.name == 'postgresql'
+    return mode == "postgres"
+
+def live_checkin_messages(checkins):
+    return [{"event_id": event_id, "user_id": user_id, "timestamp": timestamp.strftime("%Y-%m-%d %H:%M:%S")}
+            for user_id, event_id, timestamp in checkins]
+
+def notify_checkins(checkins):
+    """Send one NOTIFY per committed check-in, in a single statement.
+
+    Runs after the check-in commits, on its own autocommit connection: Postgres
+    serializes the commits of all transactions that NOTIFY, so doing it inside
+    the check-in transaction would serialize every check-in.
+    """
+    payloads = [json.dumps(message) for message in live_checkin_messages(checkins)]
+    with db.engine.connect() as connection:
+        connection.execution_options(isolation_level="AUTOCOMMIT").execute(
+            db.text("SELECT pg_notify(:channel, payload) FROM unnest(CAST(:payloads AS text[])) AS payload"),
+            {"channel": current_app.config['LIVE_FEED_CHANNEL'], "payloads": payloads},
+        )
+
+# ================================
+# CHECK-INS
+# ================================
+
+def record_checkins(checkins):
+    """Update derived aggregates for newly inserted ``(user_id, event_id, timestamp)`` rows.
+
+    Runs inside the check-in transaction, before commit.
+    """
+    if checkins:
+        counters = add_leaderboard_checkins(checkins)
+        unlock_achievements(counters)
+        bump_metrics(checkin_metric_deltas(checkins, counters))
+
+def checkins_committed(checkins):
+    """Propagate committed ``(user_id, event_id, timestamp)`` rows to in-process state."""
+    if leaderboard_store is not None:
+        try:
+            for user_id, _, timestamp in checkins:
+                for period in LEADERBOARD_PERIODS:
+                    leaderboard_store.incr(leaderboard_period_key(period, timestamp), user_id, 1)
+        except Exception:
+            # The check-in is already committed; rebuild the store from
+            # leaderboard_score instead of failing the request.
+            logger.exception("Leaderboard write-through failed")
+            leaderboard_store.invalidate()
+    if not checkins:
+        return
+    try:
+        prune_metric_minutes_if_due()
+    except Exception:
+        logger.exception("Pruning minute counters failed")
+    if live_bridge_enabled():
+        try:
+            notify_checkins(checkins)
+        except Exception:
+            logger.exception("Live feed NOTIFY failed")
+    else:
+        for message in live_checkin_messages(checkins):
+            live_broker.publish(message["event_id"], message)
@@ -0,0 +1,129 @@
+import bisect
+import os
+import threading
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.pool import NullPool, QueuePool
+
+# Upper bounds (seconds) of the checkout latency histogram buckets.
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, float("inf"))
+
+
+class PoolMetrics:
+    """Checkout latency histogram and overflow/timeout counters for one pool."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.bucket_counts = [0] * len(LATENCY_BUCKETS)
+        self.checkouts = 0
+        self.checkout_seconds = 0.0
+        self.overflow_checkouts = 0
+        self.timeouts = 0
+        self.errors = 0
+
+    def observe(self, seconds, overflow=False):
+        with self._lock:
+            self.bucket_counts[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+            self.checkouts += 1
+            self.checkout_seconds += seconds
+            if overflow:
+                self.overflow_checkouts += 1
+
+    def failed(self, timeout=False):
+        with self._lock:
+            if timeout:
+                self.timeouts += 1
+            else:
+                self.errors += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "checkout_seconds_total": round(self.checkout_seconds, 6),
+                "checkout_latency_buckets": {str(le): count for le, count in zip(LATENCY_BUCKETS, self.bucket_counts)},
+                "overflow_checkouts": self.overflow_checkouts,
+                "timeouts": self.timeouts,
+                "errors": self.errors,
+            }
+
+
+class _MeteredPoolMixin:
+    kind = None
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.metrics.failed(timeout=True)
+            raise
+        except Exception:
+            self.metrics.failed()
+            raise
+        self.metrics.observe(time.perf_counter() - start, overflow=self._in_overflow())
+        return connection
+
+    def _in_overflow(self):
+        return False
+
+    def recreate(self):
+        # Keep counting across dispose()/recreate() (e.g. after fork).
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+    def status_snapshot(self):
+        return dict(self.metrics.snapshot(), pool_class=self.kind)
+
+
+class MeteredQueuePool(_MeteredPoolMixin, QueuePool):
+    kind = "queue"
+
+    def _in_overflow(self):
+        return self.overflow() > 0
+
+    def status_snapshot(self):
+        return dict(super().status_snapshot(), size=self.size(), checked_out=self.checkedout(),
+                    overflow=max(self.overflow(), 0), checked_in=self.checkedin())
+
+
+class MeteredNullPool(_MeteredPoolMixin, NullPool):
+    kind = "null"
+
+
+def engine_options_from_env(database_url, environ=os.environ):
+    """SQLAlchemy engine options from DB_POOL_* environment variables.
+
+    Only variables that are set are passed on; SQLite keeps
+    Flask-SQLAlchemy's pool defaults. DB_POOL_CLASS=null disables pooling
+    (e.g. behind PgBouncer in transaction mode).
+    """
+    pool_class = environ.get("DB_POOL_CLASS", "queue").lower()
+    if pool_class not in ("queue", "null"):
+        raise ValueError("DB_POOL_CLASS must be 'queue' or 'null'")
+
+    options = {}
+    if "DB_POOL_PRE_PING" in environ:
+        options["pool_pre_ping"] = environ["DB_POOL_PRE_PING"].lower() in ("1", "true", "yes")
+    if "DB_POOL_RECYCLE" in environ:
+        options["pool_recycle"] = int(environ["DB_POOL_RECYCLE"])
+
+    if database_url.startswith("sqlite"):
+        return options
+
+    if pool_class == "null":
+        options["poolclass"] = MeteredNullPool
+        return options
+
+    options["poolclass"] = MeteredQueuePool
+    for env_name, option in (("DB_POOL_SIZE", "pool_size"), ("DB_MAX_OVERFLOW", "max_overflow"),
+                             ("DB_POOL_TIMEOUT", "pool_timeout")):
+        if env_name in environ:
+            options[option] = int(environ[env_name])
+    return options
@@ -0,0 +1,100 @@
+import itertools
+import logging
+import threading
+import time
+
+from flask import g, has_app_context
+from flask_sqlalchemy.session import Session
+from sqlalchemy import exc, text
+
+logger = logging.getLogger(__name__)
+
+
+def replica_binds(urls):
+    """Map ``replica_0``, ``replica_1``, ... bind keys to a comma-separated URL list."""
+    urls = [url.strip() for url in (urls or "").split(",") if url.strip()]
+    return {f"replica_{index}": url for index, url in enumerate(urls)}
+
+
+class ReplicaSet:
+    """Round-robin over healthy read replicas.
+
+    Health is checked lazily, at most every ``check_interval`` seconds per
+    replica, with ``SELECT 1`` and, when ``max_lag`` is set, the replay lag
+    reported by Postgres. A replica marked down is retried after the same
+    interval.
+    """
+
+    def __init__(self, bind_keys, check_interval=10.0, max_lag=None):
+        self.bind_keys = list(bind_keys)
+        self.check_interval = check_interval
+        self.max_lag = max_lag
+        self._healthy = {key: True for key in self.bind_keys}
+        self._checked_at = {key: 0.0 for key in self.bind_keys}
+        self._cycle = itertools.cycle(self.bind_keys)
+        self._lock = threading.Lock()
+
+    def __bool__(self):
+        return bool(self.bind_keys)
+
+    def choose(self, engines):
+        """Bind key of the next healthy replica, or None to fall back to the primary."""
+        for _ in range(len(self.bind_keys)):
+            with self._lock:
+                key = next(self._cycle)
+            if self._is_healthy(key, engines[key]):
+                return key
+        return None
+
+    def mark_down(self, key):
+        logger.warning("Read replica %s marked down", key)
+        with self._lock:
+            self._healthy[key] = False
+            self._checked_at[key] = time.monotonic()
+
+    def status(self):
+        with self._lock:
+            return dict(self._healthy)
+
+    def _is_healthy(self, key, engine):
+        now = time.monotonic()
+        with self._lock:
+            if now - self._checked_at[key] < self.check_interval:
+                return self._healthy[key]
+            self._checked_at[key] = now
+
+        healthy = self._check(engine)
+        with self._lock:
+            self._healthy[key] = healthy
+        return healthy
+
+    def _check(self, engine):
+        try:
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+                if self.max_lag is not None and engine.dialect.name == 'postgresql':
+                    lag = conn.execute(text(
+                        "SELECT COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)"
+                    )).scalar()
+                    if lag > self.max_lag:
+                        logger.warning("Read replica %s lagging %.1fs", engine.url.host, lag)
+                        return False
+            return True
+        except exc.DBAPIError:
+            return False
+
+
+class RoutingSession(Session):
+    """Session that sends SELECTs to the replica chosen for the current request.
+
+    Views opt in by setting ``g.db_replica`` to a bind key (see the
+    ``read_only`` decorator in views/common.py); writes, flushes and anything outside
+    such a view use the normal binds.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing and has_app_context():
+            key = g.get("db_replica")
+            if key is not None and (clause is None or getattr(clause, "is_select", False)):
+                return self._db.engines[key]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
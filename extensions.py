@@ -0,0 +1,65 @@
+"""Extensions and process-wide services shared by the blueprints.
+
+Flask extensions are bound to the app in ``create_app``. The services are
+built from :class:`config.Config` when this module is first imported. Under
+``gunicorn --preload`` that happens once in the master. Each service creates
+its pools, threads and connections lazily, so every forked worker still gets
+its own.
+"""
+from flask_cors import CORS
+from flask_jwt_extended import JWTManager
+from flask_sqlalchemy import SQLAlchemy
+
+from achievements import AchievementRules
+from checkin_tokens import CheckinTokens
+from config import Config
+from db_routing import ReplicaSet, RoutingSession
+from leaderboard_store import UsernameCache, create_leaderboard_store
+from live_feed import Broker
+from metrics import MetricsRegistry
+from passwords import PasswordHasher
+from qr_cache import QRCache
+from ratelimit import RateLimiter, create_bucket_store
+
+db = SQLAlchemy(session_options={"class_": RoutingSession})
+jwt = JWTManager()
+cors = CORS()
+
+qr_cache = QRCache(max_entries=Config.QR_CACHE_SIZE, disk_dir=Config.QR_CACHE_DIR, namespace=Config.API_URL,
+                   disk_max_entries=Config.QR_CACHE_DISK_MAX)
+
+checkin_tokens = None
+if Config.CHECKIN_TOKEN_TTL:
+    checkin_tokens = CheckinTokens(Config.CHECKIN_TOKEN_SECRET, Config.CHECKIN_TOKEN_TTL)
+
+leaderboard_store = None
+if Config.LEADERBOARD_STORE != "sql":
+    leaderboard_store = create_leaderboard_store(Config.LEADERBOARD_STORE, redis_url=Config.REDIS_URL,
+                                                 ttl=Config.LEADERBOARD_MEMORY_TTL)
+username_cache = UsernameCache(max_entries=Config.USERNAME_CACHE_SIZE, ttl=Config.USERNAME_CACHE_TTL)
+
+password_hasher = PasswordHasher(
+    scheme=Config.PASSWORD_HASH_SCHEME,
+    cost=Config.PASSWORD_HASH_COST,
+    workers=Config.PASSWORD_HASH_WORKERS,
+    max_pending=Config.PASSWORD_HASH_MAX_PENDING,
+)
+
+rate_limiter = RateLimiter(
+    create_bucket_store(Config.RATELIMIT_STORE, redis_url=Config.REDIS_URL),
+    {
+        "login_ip": Config.RATELIMIT_LOGIN_PER_IP,
+        "login_user_ip": Config.RATELIMIT_LOGIN_PER_USER_IP,
+        "login_user": Config.RATELIMIT_LOGIN_PER_USER,
+        "register_ip": Config.RATELIMIT_REGISTER_PER_IP,
+    },
+)
+
+metrics = MetricsRegistry(directory=Config.METRICS_DIR, flush_interval=Config.METRICS_FLUSH_INTERVAL)
+
+replica_set = ReplicaSet(Config.SQLALCHEMY_BINDS, check_interval=Config.REPLICA_CHECK_INTERVAL,
+                         max_lag=Config.REPLICA_MAX_LAG)
+
+live_broker = Broker()
+
+achievement_rules = AchievementRules()
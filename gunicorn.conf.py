@@ -0,0 +1,85 @@
+"""Gunicorn settings for TrakZone.
+
+Every setting can be overridden from the environment, e.g.
+
+    GUNICORN_WORKER_CLASS=gevent WEB_CONCURRENCY=4 gunicorn -c gunicorn.conf.py app:app
+
+Worker classes:
+
+* ``sync`` (gunicorn default): one request per process at a time.
+* ``gthread``: ``GUNICORN_THREADS`` requests per process on OS threads.
+* ``gevent``: ``GUNICORN_WORKER_CONNECTIONS`` greenlets per process. psycopg2
+  is made cooperative with psycogreen in ``post_fork`` so a query waiting on
+  Postgres yields to other requests instead of blocking the worker.
+  Flask-SQLAlchemy scopes sessions to the app context, which gevent keeps per
+  greenlet, so requests never share a session. Size the SQLAlchemy pool for
+  the number of greenlets that hit the database at once.
+
+The live feed (``GET /events/<id>/live``) holds its connection open. Under
+``sync`` workers each subscriber ties up a whole worker until
+``GUNICORN_TIMEOUT`` kills it, so serve it with ``gevent`` (or ``gthread``,
+one thread per subscriber).
+
+Set ``METRICS_DIR`` to a directory private to this server (ideally a tmpfs)
+so ``/metrics`` reports totals across all workers rather than only for the
+worker that answers the scrape.
+
+With ``GUNICORN_PRELOAD=true`` the app is imported once in the master and
+workers fork from it. Objects that exist at fork time are frozen out of the
+garbage collector so collections in a worker don't touch (and so copy) the
+pages shared with the master, and inherited connection pools are dropped
+without closing sockets that belong to the master.
+"""
+import gc
+import multiprocessing
+import os
+
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "sync")
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.getenv("GUNICORN_THREADS", 1 if worker_class != "gthread" else 8))
+worker_connections = int(os.getenv("GUNICORN_WORKER_CONNECTIONS", 1000))
+
+bind = os.getenv("GUNICORN_BIND", f"0.0.0.0:{os.getenv('PORT', '5000')}")
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", 5))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 30))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", 30))
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", 0))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", 0))
+preload_app = os.getenv("GUNICORN_PRELOAD", "false").lower() == "true"
+
+accesslog = os.getenv("GUNICORN_ACCESSLOG") or None
+errorlog = "-"
+loglevel = os.getenv("GUNICORN_LOGLEVEL", "info")
+
+if worker_class == "gevent" and preload_app:
+    # The app is imported in the master before workers patch themselves, so
+    # patch here or its locks and sockets would be the blocking originals.
+    from gevent import monkey
+
+    monkey.patch_all()
+
+
+def on_starting(server):
+    from metrics import clear_directory
+
+    clear_directory(os.getenv("METRICS_DIR"))
+
+
+def pre_fork(server, worker):
+    if preload_app:
+        gc.freeze()
+
+
+def post_fork(server, worker):
+    if preload_app:
+        from extensions import db
+
+        with server.app.wsgi().app_context():
+            for engine in db.engines.values():
+                engine.dispose(close=False)
+
+    if worker_class == "gevent":
+        from psycogreen.gevent import patch_psycopg
+
+        patch_psycopg()
+        server.log.info("Worker %s: psycopg2 patched for gevent", worker.pid)
@@ -0,0 +1,337 @@
+import logging
+import random
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+class _Node:
+    __slots__ = ("key", "next", "width")
+
+    def __init__(self, key, level):
+        self.key = key
+        self.next = [None] * level
+        # width[i] = number of level-0 steps from this node to next[i]
+        self.width = [1] * level
+
+
+class IndexableSkipList:
+    """Sorted list of unique keys with O(log n) insert, remove and position lookup."""
+
+    MAX_LEVEL = 24
+
+    def __init__(self):
+        self._head = _Node(None, self.MAX_LEVEL)
+        self._size = 0
+
+    @classmethod
+    def from_sorted(cls, keys):
+        """Build from ascending unique ``keys`` in O(n), linking each level left to right."""
+        skiplist = cls()
+        last = [skiplist._head] * cls.MAX_LEVEL
+        last_position = [0] * cls.MAX_LEVEL
+        position = 0
+        for key in keys:
+            position += 1
+            node = _Node(key, skiplist._random_level())
+            for i in range(len(node.next)):
+                last[i].next[i] = node
+                last[i].width[i] = position - last_position[i]
+                last[i], last_position[i] = node, position
+        for i in range(cls.MAX_LEVEL):
+            last[i].width[i] = position + 1 - last_position[i]
+        skiplist._size = position
+        return skiplist
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        node = self._head.next[0]
+        while node is not None:
+            yield node.key
+            node = node.next[0]
+
+    def _random_level(self):
+        level = 1
+        while level < self.MAX_LEVEL and random.random() < 0.5:
+            level += 1
+        return level
+
+    def insert(self, key):
+        update = [None] * self.MAX_LEVEL
+        positions = [0] * self.MAX_LEVEL
+        node, position = self._head, 0
+        for i in reversed(range(self.MAX_LEVEL)):
+            while node.next[i] is not None and node.next[i].key < key:
+                position += node.width[i]
+                node = node.next[i]
+            update[i], positions[i] = node, position
+
+        level = self._random_level()
+        new = _Node(key, level)
+        new_position = position + 1
+        for i in range(self.MAX_LEVEL):
+            prev = update[i]
+            if i < level:
+                distance = new_position - positions[i]
+                new.next[i] = prev.next[i]
+                new.width[i] = prev.width[i] - distance + 1
+                prev.next[i] = new
+                prev.width[i] = distance
+            else:
+                prev.width[i] += 1
+        self._size += 1
+
+    def remove(self, key):
+        update = [None] * self.MAX_LEVEL
+        node = self._head
+        for i in reversed(range(self.MAX_LEVEL)):
+            while node.next[i] is not None and node.next[i].key < key:
+                node = node.next[i]
+            update[i] = node
+
+        target = update[0].next[0]
+        if target is None or target.key != key:
+            raise KeyError(key)
+
+        for i in range(self.MAX_LEVEL):
+            prev = update[i]
+            if prev.next[i] is target:
+                prev.width[i] += target.width[i] - 1
+                prev.next[i] = target.next[i]
+            else:
+                prev.width[i] -= 1
+        self._size -= 1
+
+    def bisect_left(self, key):
+        """Number of keys strictly less than ``key``."""
+        node, position = self._head, 0
+        for i in reversed(range(self.MAX_LEVEL)):
+            while node.next[i] is not None and node.next[i].key < key:
+                position += node.width[i]
+                node = node.next[i]
+        return position
+
+
+class SortedScoreSet:
+    """Member -> score map kept ordered by score (highest first), like a Redis ZSET."""
+
+    def __init__(self, scores=None):
+        self._scores = dict(scores or {})
+        self._order = IndexableSkipList.from_sorted(
+            sorted((-score, member) for member, score in self._scores.items()))
+
+    def __len__(self):
+        return len(self._scores)
+
+    def score(self, member):
+        return self._scores.get(member)
+
+    def incr(self, member, delta):
+        old = self._scores.get(member)
+        if old is not None:
+            self._order.remove((-old, member))
+        new = (old or 0) + delta
+        self._scores[member] = new
+        self._order.insert((-new, member))
+        return new
+
+    def top(self, n):
+        result = []
+        for negative_score, member in self._order:
+            if len(result) >= n:
+                break
+            result.append((member, -negative_score))
+        return result
+
+    def count_above(self, score):
+        # (-score,) sorts before every (-score, member) key, so this counts
+        # members with a strictly higher score.
+        return self._order.bisect_left((-score,))
+
+
+class MemoryLeaderboardStore:
+    """In-process boards of sorted scores.
+
+    Each gunicorn worker holds its own copy, so write-through only reaches the
+    worker that served the check-in; ``ttl`` forces a periodic reload from the
+    database to pick up the others. Use the Redis store to share one copy.
+    """
+
+    def __init__(self, ttl=5.0):
+        self.ttl = ttl
+        self._boards = {}
+        self._loaded_at = None
+        self._stale = False
+        self._lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+
+    def refresh(self, load):
+        """Reload from ``load()``, which returns ``{board: {member: score}}``, when due.
+
+        The first load blocks callers until it is done. Later reloads run in a
+        background thread, one at a time, while readers keep the current boards.
+        """
+        if self._loaded_at is None:
+            with self._reload_lock:
+                if self._loaded_at is None:
+                    self._reload(load)
+            return
+        expired = bool(self.ttl) and time.monotonic() - self._loaded_at > self.ttl
+        if (self._stale or expired) and self._reload_lock.acquire(blocking=False):
+            threading.Thread(target=self._reload_in_background, args=(load,), daemon=True).start()
+
+    def _reload(self, load):
+        self._stale = False
+        self.replace(load())
+
+    def _reload_in_background(self, load):
+        try:
+            self._reload(load)
+        except Exception:
+            logger.exception("Leaderboard reload failed")
+            self._stale = True
+        finally:
+            self._reload_lock.release()
+
+    def invalidate(self):
+        """Reload on the next read, e.g. after a write-through failed."""
+        self._stale = True
+
+    def replace(self, boards):
+        """Swap in ``{board: {member: score}}`` wholesale."""
+        fresh = {board: SortedScoreSet(scores) for board, scores in boards.items()}
+        with self._lock:
+            self._boards = fresh
+            self._loaded_at = time.monotonic()
+
+    def incr(self, board, member, delta):
+        with self._lock:
+            scores = self._boards.setdefault(board, SortedScoreSet())
+            return scores.incr(member, delta)
+
+    def top(self, board, n):
+        with self._lock:
+            scores = self._boards.get(board)
+            return scores.top(n) if scores else []
+
+    def rank(self, board, member):
+        """Return ``(rank, score)``; tied members share the better rank."""
+        with self._lock:
+            scores = self._boards.get(board)
+            score = (scores.score(member) if scores else None) or 0
+            ahead = scores.count_above(score) if scores else 0
+        return ahead + 1, score
+
+
+class RedisLeaderboardStore:
+    """Boards kept as Redis sorted sets, shared by every worker.
+
+    ``client`` is anything with the redis-py sorted-set API (redis.Redis,
+    fakeredis.FakeRedis, ...).
+    """
+
+    def __init__(self, client, prefix="trakzone:leaderboard:", rebuild_interval=300):
+        self.client = client
+        self.prefix = prefix
+        self.rebuild_interval = rebuild_interval
+        self._checked = False
+        self._stale = False
+
+    def _key(self, board):
+        return f"{self.prefix}{board}"
+
+    def refresh(self, load):
+        """Rebuild from ``load()`` on first use, or after this worker failed a write."""
+        if self._stale:
+            self.replace(load())
+            self._stale = False
+            return
+        if self._checked:
+            return
+        self._checked = True
+        # Only one worker per interval rebuilds; the rest trust Redis.
+        if self.client.set(self._key("rebuilt"), 1, nx=True, ex=self.rebuild_interval):
+            self.replace(load())
+
+    def invalidate(self):
+        """Rebuild on this worker's next read, e.g. after a write-through failed."""
+        self._stale = True
+
+    def replace(self, boards):
+        pipe = self.client.pipeline()
+        for board, scores in boards.items():
+            pipe.delete(self._key(board))
+            if scores:
+                pipe.zadd(self._key(board), scores)
+        pipe.execute()
+
+    def incr(self, board, member, delta):
+        return int(self.client.zincrby(self._key(board), delta, member))
+
+    def top(self, board, n):
+        rows = self.client.zrevrange(self._key(board), 0, n - 1, withscores=True)
+        return [(int(member), int(score)) for member, score in rows]
+
+    def rank(self, board, member):
+        score = int(self.client.zscore(self._key(board), member) or 0)
+        ahead = self.client.zcount(self._key(board), f"({score}", "+inf")
+        return ahead + 1, score
+
+
+class UsernameCache:
+    """Bounded LRU of ``user_id -> username`` for boards served from a store.
+
+    Store boards only hold user ids. Entries expire after ``ttl`` seconds, so
+    a rename made through another worker shows up here eventually;
+    ``invalidate`` drops an entry as soon as this worker sees the change.
+    """
+
+    def __init__(self, max_entries=10000, ttl=300.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, user_ids, load):
+        """Return ``{user_id: username}``; ``load(missing)`` fetches the misses the same way."""
+        now = time.monotonic()
+        found, missing = {}, []
+        with self._lock:
+            for user_id in user_ids:
+                entry = self._entries.get(user_id)
+                if entry is not None and (not self.ttl or now - entry[1] <= self.ttl):
+                    self._entries.move_to_end(user_id)
+                    found[user_id] = entry[0]
+                else:
+                    missing.append(user_id)
+        if missing:
+            loaded = load(missing)
+            with self._lock:
+                for user_id, username in loaded.items():
+                    self._entries[user_id] = (username, now)
+                    self._entries.move_to_end(user_id)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            found.update(loaded)
+        return {user_id: found.get(user_id) for user_id in user_ids}
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+
+def create_leaderboard_store(backend, redis_url=None, ttl=5.0):
+    """Build the store named by ``backend`` ("memory" or "redis")."""
+    if backend == "redis":
+        try:
+            import redis
+        except ImportError as exc:
+            raise RuntimeError("LEADERBOARD_STORE=redis requires the 'redis' package") from exc
+        return RedisLeaderboardStore(redis.Redis.from_url(redis_url))
+    if backend == "memory":
+        return MemoryLeaderboardStore(ttl=ttl)
+    raise ValueError(f"Unknown leaderboard store: {backend}")
@@ -0,0 +1,159 @@
+import json
+import logging
+import queue
+import select
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class Subscription:
+    """One subscriber's bounded message queue.
+
+    A slow consumer never blocks the publisher: when its queue is full the
+    oldest message is dropped.
+    """
+
+    def __init__(self, broker, channel, maxsize):
+        self.broker = broker
+        self.channel = channel
+        self.queue = queue.Queue(maxsize)
+
+    def deliver(self, message):
+        while True:
+            try:
+                self.queue.put_nowait(message)
+                return
+            except queue.Full:
+                try:
+                    self.queue.get_nowait()
+                except queue.Empty:
+                    pass
+
+    def get(self, timeout=None):
+        """Next message, or None if nothing arrived within ``timeout`` seconds."""
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class Broker:
+    """In-process pub/sub: one publish fans out to every subscriber of a channel."""
+
+    def __init__(self):
+        self._channels = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, channel, maxsize=100):
+        subscription = Subscription(self, channel, maxsize)
+        with self._lock:
+            self._channels.setdefault(channel, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._channels.get(subscription.channel)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._channels[subscription.channel]
+
+    def publish(self, channel, message):
+        with self._lock:
+            subscribers = list(self._channels.get(channel, ()))
+        for subscription in subscribers:
+            subscription.deliver(message)
+        return len(subscribers)
+
+    def subscriber_count(self, channel=None):
+        with self._lock:
+            if channel is not None:
+                return len(self._channels.get(channel, ()))
+            return sum(len(subscribers) for subscribers in self._channels.values())
+
+
+class PostgresNotifyBridge(threading.Thread):
+    """Relay Postgres NOTIFY messages into a local :class:`Broker`.
+
+    Every worker runs one bridge, so a check-in committed by any worker
+    reaches subscribers connected to all of them. ``connect`` returns a
+    DB-API (psycopg2) connection; payloads are JSON objects and are
+    published on ``payload[channel_field]``.
+    """
+
+    def __init__(self, connect, pg_channel, broker, channel_field="event_id", poll_interval=5.0):
+        super().__init__(name=f"notify-bridge-{pg_channel}", daemon=True)
+        self.connect = connect
+        self.pg_channel = pg_channel
+        self.broker = broker
+        self.channel_field = channel_field
+        self.poll_interval = poll_interval
+        self._stopped = threading.Event()
+
+    def stop(self):
+        self._stopped.set()
+
+    def run(self):
+        backoff = 1.0
+        while not self._stopped.is_set():
+            try:
+                self._listen()
+                backoff = 1.0
+            except Exception:
+                logger.exception("LISTEN %s failed; reconnecting in %.0fs", self.pg_channel, backoff)
+                self._stopped.wait(backoff)
+                backoff = min(backoff * 2, 30.0)
+
+    def _listen(self):
+        conn = self.connect()
+        try:
+            conn.autocommit = True
+            with conn.cursor() as cursor:
+                cursor.execute(f"LISTEN {self.pg_channel}")
+            while not self._stopped.is_set():
+                if select.select([conn], [], [], self.poll_interval) == ([], [], []):
+                    continue
+                conn.poll()
+                while conn.notifies:
+                    self._relay(conn.notifies.pop(0).payload)
+        finally:
+            conn.close()
+
+    def _relay(self, payload):
+        try:
+            message = json.loads(payload)
+            self.broker.publish(message[self.channel_field], message)
+        except (ValueError, KeyError, TypeError):
+            logger.warning("Ignoring malformed %s payload: %r", self.pg_channel, payload)
+
+
+def format_sse(data, event=None):
+    lines = [f"event: {event}"] if event else []
+    lines.append(f"data: {json.dumps(data)}")
+    return "\n".join(lines) + "\n\n"
+
+
+def sse_stream(subscription, render, heartbeat=15.0):
+    """Yield SSE frames for messages on ``subscription``, with keep-alive comments."""
+    with subscription:
+        yield ": connected\n\n"
+        last_sent = time.monotonic()
+        while True:
+            message = subscription.get(timeout=heartbeat)
+            if message is not None:
+                yield render(message)
+                last_sent = time.monotonic()
+            elif time.monotonic() - last_sent >= heartbeat:
+                yield ": keep-alive\n\n"
+                last_sent = time.monotonic()
@@ -0,0 +1,169 @@
+import atexit
+import bisect
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from db_pool import LATENCY_BUCKETS
+
+
+def _format_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in pairs) + "}"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_le(bound):
+    return "+Inf" if bound == float("inf") else repr(bound)
+
+
+class MetricsRegistry:
+    """Counters and histograms rendered in the Prometheus text format.
+
+    Each gunicorn worker keeps its own values. With ``directory`` set, a
+    worker writes them to ``<directory>/<pid>.json`` at most every
+    ``flush_interval`` seconds and at exit, and :meth:`render` sums every
+    file there, so whichever worker answers the scrape reports the totals
+    for all of them. Files from exited workers are kept so counters never
+    go backwards.
+    """
+
+    def __init__(self, directory=None, flush_interval=1.0, buckets=LATENCY_BUCKETS):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self.buckets = buckets
+        self._meta = {}
+        self._counters = {}
+        self._histograms = {}
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self._flushed_at = 0.0
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            atexit.register(self.flush)
+
+    def counter(self, name, help):
+        self._meta[name] = ("counter", help)
+
+    def histogram(self, name, help):
+        self._meta[name] = ("histogram", help)
+
+    def inc(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._check_fork()
+            self._counters[key] = self._counters.get(key, 0) + value
+        self._maybe_flush()
+
+    def observe(self, name, seconds, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._check_fork()
+            series = self._histograms.get(key)
+            if series is None:
+                series = self._histograms[key] = [[0] * len(self.buckets), 0, 0.0]
+            series[0][bisect.bisect_left(self.buckets, seconds)] += 1
+            series[1] += 1
+            series[2] += seconds
+        self._maybe_flush()
+
+    @contextmanager
+    def timer(self, name, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def _check_fork(self):
+        # Values recorded in the gunicorn master before fork belong to it, not to each worker.
+        if os.getpid() != self._pid:
+            self._pid = os.getpid()
+            self._counters.clear()
+            self._histograms.clear()
+
+    def _snapshot(self):
+        with self._lock:
+            self._check_fork()
+            return {
+                "counters": [[name, labels, value] for (name, labels), value in self._counters.items()],
+                "histograms": [[name, labels, list(buckets), count, total]
+                               for (name, labels), (buckets, count, total) in self._histograms.items()],
+            }
+
+    def _maybe_flush(self):
+        if self.directory and time.monotonic() - self._flushed_at >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        if not self.directory:
+            return
+        self._flushed_at = time.monotonic()
+        path = os.path.join(self.directory, f"{os.getpid()}.json")
+        tmp = f"{path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(self._snapshot(), f)
+        os.replace(tmp, path)
+
+    def _collect(self):
+        snapshots = [self._snapshot()]
+        if self.directory:
+            own = f"{os.getpid()}.json"
+            for name in os.listdir(self.directory):
+                if not name.endswith(".json") or name == own:
+                    continue
+                try:
+                    with open(os.path.join(self.directory, name)) as f:
+                        snapshots.append(json.load(f))
+                except (OSError, ValueError):
+                    continue
+
+        counters, histograms = {}, {}
+        for snapshot in snapshots:
+            for name, labels, value in snapshot["counters"]:
+                key = (name, tuple(tuple(pair) for pair in labels))
+                counters[key] = counters.get(key, 0) + value
+            for name, labels, buckets, count, total in snapshot["histograms"]:
+                key = (name, tuple(tuple(pair) for pair in labels))
+                merged = histograms.setdefault(key, [[0] * len(buckets), 0, 0.0])
+                merged[0] = [a + b for a, b in zip(merged[0], buckets)]
+                merged[1] += count
+                merged[2] += total
+        return counters, histograms
+
+    def render(self):
+        counters, histograms = self._collect()
+        lines = []
+        for name, (kind, help) in sorted(self._meta.items()):
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {kind}")
+            if kind == "counter":
+                for (series, labels), value in sorted(counters.items()):
+                    if series == name:
+                        lines.append(f"{name}{_format_labels(labels)} {value}")
+                continue
+            for (series, labels), (buckets, count, total) in sorted(histograms.items()):
+                if series != name:
+                    continue
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets, buckets):
+                    cumulative += bucket_count
+                    lines.append(f"{name}_bucket{_format_labels(labels, [('le', _format_le(bound))])} {cumulative}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {total}")
+                lines.append(f"{name}_count{_format_labels(labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+
+def clear_directory(directory):
+    """Remove worker files left by a previous run (call once, before workers start)."""
+    if directory and os.path.isdir(directory):
+        for name in os.listdir(directory):
+            if name.endswith(".json") or name.endswith(".json.tmp"):
+                os.remove(os.path.join(directory, name))
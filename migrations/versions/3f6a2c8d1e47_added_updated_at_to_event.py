@@ -0,0 +1,26 @@
+"""Added updated_at to Event
+
+Revision ID: 3f6a2c8d1e47
+Revises: 97db1bf12028
+Create Date: 2025-04-02 10:14:37.512904
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f6a2c8d1e47'
+down_revision = '97db1bf12028'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('event', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table('event', schema=None) as batch_op:
+        batch_op.drop_column('updated_at')
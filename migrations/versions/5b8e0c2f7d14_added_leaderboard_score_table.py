@@ -0,0 +1,47 @@
+"""Added leaderboard_score table
+
+Revision ID: 5b8e0c2f7d14
+Revises: d4e7a1f06b93
+Create Date: 2025-04-09 14:20:31.415096
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b8e0c2f7d14'
+down_revision = 'd4e7a1f06b93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('leaderboard_score',
+    sa.Column('period', sa.String(length=16), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('checkins', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('period', 'user_id')
+    )
+    with op.batch_alter_table('leaderboard_score', schema=None) as batch_op:
+        batch_op.create_index('ix_leaderboard_score_period_checkins', ['period', sa.text('checkins DESC'), 'user_id'], unique=False)
+
+    # Backfill from existing check-ins.
+    op.execute("""
+        INSERT INTO leaderboard_score (period, user_id, checkins)
+        SELECT 'all', user_id, count(*) FROM check_in GROUP BY user_id
+        UNION ALL
+        SELECT 'week:' || to_char(timestamp, 'IYYY-"W"IW'), user_id, count(*)
+        FROM check_in WHERE timestamp IS NOT NULL GROUP BY 1, 2
+        UNION ALL
+        SELECT 'month:' || to_char(timestamp, 'YYYY-MM'), user_id, count(*)
+        FROM check_in WHERE timestamp IS NOT NULL GROUP BY 1, 2
+    """)
+
+
+def downgrade():
+    with op.batch_alter_table('leaderboard_score', schema=None) as batch_op:
+        batch_op.drop_index('ix_leaderboard_score_period_checkins')
+
+    op.drop_table('leaderboard_score')
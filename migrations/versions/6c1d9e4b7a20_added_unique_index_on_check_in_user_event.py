@@ -0,0 +1,31 @@
+"""Added unique index on check_in (user_id, event_id)
+
+Revision ID: 6c1d9e4b7a20
+Revises: 3f6a2c8d1e47
+Create Date: 2025-04-03 16:42:09.880213
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6c1d9e4b7a20'
+down_revision = '3f6a2c8d1e47'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Keep the earliest check-in of any duplicated pair so the index can be built.
+    op.execute(
+        "DELETE FROM check_in a USING check_in b "
+        "WHERE a.user_id = b.user_id AND a.event_id = b.event_id AND a.id > b.id"
+    )
+    with op.batch_alter_table('check_in', schema=None) as batch_op:
+        batch_op.create_index('ix_check_in_user_id_event_id', ['user_id', 'event_id'], unique=True)
+
+
+def downgrade():
+    with op.batch_alter_table('check_in', schema=None) as batch_op:
+        batch_op.drop_index('ix_check_in_user_id_event_id')
@@ -0,0 +1,45 @@
+"""Added metric_counter table
+
+Revision ID: 7a4d2e9b1c35
+Revises: e9c3a7d25f08
+Create Date: 2025-04-14 10:37:58.104662
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7a4d2e9b1c35'
+down_revision = 'e9c3a7d25f08'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('metric_counter',
+    sa.Column('kind', sa.String(length=16), nullable=False),
+    sa.Column('key', sa.String(length=32), nullable=False),
+    sa.Column('value', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('kind', 'key')
+    )
+
+    # Seed the counters from the existing rows; from here on they are
+    # maintained incrementally by the application.
+    op.execute("""
+        INSERT INTO metric_counter (kind, key, value, updated_at)
+        SELECT 'total', 'users', count(*), now() FROM "user"
+        UNION ALL SELECT 'total', 'events', count(*), now() FROM event
+        UNION ALL SELECT 'total', 'checkins', count(*), now() FROM check_in
+        UNION ALL SELECT 'total', 'participants', count(DISTINCT user_id), now() FROM check_in
+        UNION ALL
+        SELECT 'event', event_id::text, count(*), now() FROM check_in GROUP BY event_id
+        UNION ALL
+        SELECT 'minute', to_char(timestamp, 'YYYY-MM-DD HH24:MI'), count(*), now()
+        FROM check_in WHERE timestamp IS NOT NULL GROUP BY 2
+    """)
+
+
+def downgrade():
+    op.drop_table('metric_counter')
@@ -0,0 +1,26 @@
+"""Added (event_id, user_id) index on check_in
+
+Revision ID: a82f5b3c9d61
+Revises: 6c1d9e4b7a20
+Create Date: 2025-04-05 11:08:52.204417
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a82f5b3c9d61'
+down_revision = '6c1d9e4b7a20'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('check_in', schema=None) as batch_op:
+        batch_op.create_index('ix_check_in_event_id_user_id', ['event_id', 'user_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('check_in', schema=None) as batch_op:
+        batch_op.drop_index('ix_check_in_event_id_user_id')
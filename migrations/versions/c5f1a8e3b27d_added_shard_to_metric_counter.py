@@ -0,0 +1,51 @@
+"""Added shard to metric_counter
+
+Revision ID: c5f1a8e3b27d
+Revises: 7a4d2e9b1c35
+Create Date: 2025-04-16 09:12:40.518233
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c5f1a8e3b27d'
+down_revision = '7a4d2e9b1c35'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('metric_counter', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('shard', sa.SmallInteger(), nullable=False, server_default='0'))
+        batch_op.drop_constraint('metric_counter_pkey', type_='primary')
+        batch_op.create_primary_key('metric_counter_pkey', ['kind', 'key', 'shard'])
+
+
+def downgrade():
+    # Fold the shards back into one row per counter.
+    op.execute("""
+        CREATE TEMPORARY TABLE metric_counter_merged AS
+        SELECT kind, key, sum(value) AS value, max(updated_at) AS updated_at
+        FROM metric_counter GROUP BY kind, key
+    """)
+    op.execute("DELETE FROM metric_counter WHERE shard <> 0")
+    op.execute("""
+        UPDATE metric_counter SET value = m.value, updated_at = m.updated_at
+        FROM metric_counter_merged m
+        WHERE metric_counter.kind = m.kind AND metric_counter.key = m.key
+    """)
+    op.execute("""
+        INSERT INTO metric_counter (kind, key, shard, value, updated_at)
+        SELECT m.kind, m.key, 0, m.value, m.updated_at FROM metric_counter_merged m
+        WHERE NOT EXISTS (
+            SELECT 1 FROM metric_counter c WHERE c.kind = m.kind AND c.key = m.key
+        )
+    """)
+    op.execute("DROP TABLE metric_counter_merged")
+
+    with op.batch_alter_table('metric_counter', schema=None) as batch_op:
+        batch_op.drop_constraint('metric_counter_pkey', type_='primary')
+        batch_op.create_primary_key('metric_counter_pkey', ['kind', 'key'])
+        batch_op.drop_column('shard')
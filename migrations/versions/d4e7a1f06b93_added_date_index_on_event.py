@@ -0,0 +1,26 @@
+"""Added (date, id) index on event
+
+Revision ID: d4e7a1f06b93
+Revises: a82f5b3c9d61
+Create Date: 2025-04-07 09:51:16.637120
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4e7a1f06b93'
+down_revision = 'a82f5b3c9d61'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('event', schema=None) as batch_op:
+        batch_op.create_index('ix_event_date_id', ['date', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('event', schema=None) as batch_op:
+        batch_op.drop_index('ix_event_date_id')
@@ -0,0 +1,49 @@
+"""Added user_achievement table
+
+Revision ID: e9c3a7d25f08
+Revises: 5b8e0c2f7d14
+Create Date: 2025-04-11 17:03:44.291857
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e9c3a7d25f08'
+down_revision = '5b8e0c2f7d14'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('user_achievement',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('achievement', sa.String(length=50), nullable=False),
+    sa.Column('unlocked_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'achievement')
+    )
+
+    # Backfill from the leaderboard_score counts: check-ins only unlock the
+    # thresholds they cross, so anything already reached would never unlock.
+    # Rules as of this revision (key, counter, threshold).
+    op.execute("""
+        INSERT INTO user_achievement (user_id, achievement, unlocked_at)
+        SELECT s.user_id, a.key, now()
+        FROM leaderboard_score s
+        JOIN (VALUES
+            ('first_checkin', 'all', 1),
+            ('regular', 'all', 5),
+            ('event_champion', 'all', 10),
+            ('veteran', 'all', 50),
+            ('busy_week', 'week', 3),
+            ('monthly_marathon', 'month', 8)
+        ) AS a (key, counter, threshold)
+          ON split_part(s.period, ':', 1) = a.counter AND s.checkins >= a.threshold
+        GROUP BY s.user_id, a.key
+    """)
+
+
+def downgrade():
+    op.drop_table('user_achievement')
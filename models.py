@@ -0,0 +1,125 @@
+import random
+from datetime import datetime
+
+from sqlalchemy.dialects import postgresql, sqlite
+
+from config import Config
+from extensions import db, metrics, password_hasher
+
+class User(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    username = db.Column(db.String(100), unique=True, nullable=False)
+    email = db.Column(db.String(120), unique=True, nullable=False)
+    password_hash = db.Column(db.String(256), nullable=False)
+
+    def set_password(self, password):
+        with metrics.timer("trakzone_password_hash_seconds", operation="hash", scheme=password_hasher.scheme):
+            self.password_hash = password_hasher.hash(password)
+
+    def check_password(self, password):
+        with metrics.timer("trakzone_password_hash_seconds", operation="verify", scheme=password_hasher.scheme):
+            return password_hasher.verify(self.password_hash, password)
+
+    def password_needs_rehash(self):
+        return password_hasher.needs_rehash(self.password_hash)
+
+class Event(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(200), nullable=False)
+    date = db.Column(db.DateTime, nullable=False)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index('ix_event_date_id', 'date', 'id'),
+    )
+
+class CheckIn(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    event_id = db.Column(db.Integer, db.ForeignKey('event.id'), nullable=False)
+    timestamp = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index('ix_check_in_user_id_event_id', 'user_id', 'event_id', unique=True),
+        db.Index('ix_check_in_event_id_user_id', 'event_id', 'user_id'),
+    )
+
+    user = db.relationship('User', backref=db.backref('checkins', lazy=True))
+    event = db.relationship('Event', backref=db.backref('checkins', lazy=True))
+
+class LeaderboardScore(db.Model):
+    """Check-in count per user and period ("all", "week:2025-W14", "month:2025-04")."""
+    period = db.Column(db.String(16), primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    checkins = db.Column(db.Integer, nullable=False, default=0)
+
+# Matches the leaderboard ORDER BY so top-N is a bounded index scan.
+db.Index('ix_leaderboard_score_period_checkins',
+         LeaderboardScore.period, LeaderboardScore.checkins.desc(), LeaderboardScore.user_id)
+
+class UserAchievement(db.Model):
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    achievement = db.Column(db.String(50), primary_key=True)
+    unlocked_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+class MetricCounter(db.Model):
+    """Incrementally maintained dashboard counters.
+
+    ``kind`` is "total" (users, events, checkins, participants), "event"
+    (key = event id) or "minute" (key = "YYYY-MM-DD HH:MM").
+
+    Each counter is spread over ``shard`` rows so concurrent check-ins don't
+    queue on one row lock; readers sum the shards.
+    """
+    kind = db.Column(db.String(16), primary_key=True)
+    key = db.Column(db.String(32), primary_key=True)
+    shard = db.Column(db.SmallInteger, primary_key=True, default=0)
+    value = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+def conflict_insert(model):
+    """Dialect-specific INSERT for ``model`` that supports ``on_conflict_do_nothing``."""
+    dialect = sqlite if db.engine.dialect.name == 'sqlite' else postgresql
+    return dialect.insert(model)
+
+def bump_metrics(deltas, connection=None):
+    """Apply ``{(kind, key): delta}`` to one random shard of each metric counter in one upsert.
+
+    Rows go in key order, so concurrent upserts lock them in the same order.
+    """
+    if not deltas:
+        return
+    now = datetime.utcnow()
+    shard = random.randrange(Config.METRIC_COUNTER_SHARDS)
+    stmt = conflict_insert(MetricCounter).values(
+        [{"kind": kind, "key": key, "shard": shard, "value": delta, "updated_at": now}
+         for (kind, key), delta in sorted(deltas.items())]
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=['kind', 'key', 'shard'],
+        set_={"value": MetricCounter.value + stmt.excluded.value, "updated_at": stmt.excluded.updated_at},
+    )
+    (connection or db.session).execute(stmt)
+
+def prune_metric_minutes(before, connection=None):
+    """Delete the per-minute counters for minutes before ``before``."""
+    (connection or db.session).execute(
+        db.delete(MetricCounter)
+        .where(MetricCounter.kind == "minute", MetricCounter.key < before.strftime("%Y-%m-%d %H:%M"))
+    )
+
+@db.event.listens_for(User, 'after_insert')
+def _count_user_insert(mapper, connection, target):
+    bump_metrics({("total", "users"): 1}, connection)
+
+@db.event.listens_for(User, 'after_delete')
+def _count_user_delete(mapper, connection, target):
+    bump_metrics({("total", "users"): -1}, connection)
+
+@db.event.listens_for(Event, 'after_insert')
+def _count_event_insert(mapper, connection, target):
+    bump_metrics({("total", "events"): 1}, connection)
+
+@db.event.listens_for(Event, 'after_delete')
+def _count_event_delete(mapper, connection, target):
+    bump_metrics({("total", "events"): -1}, connection)
@@ -0,0 +1,92 @@
+import atexit
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import bcrypt
+from werkzeug.security import check_password_hash, generate_password_hash
+
+SCHEMES = ("scrypt", "pbkdf2", "bcrypt")
+
+# Cost defaults match werkzeug's (scrypt N, pbkdf2 iterations) and bcrypt's (log rounds).
+DEFAULT_COSTS = {"scrypt": 32768, "pbkdf2": 600000, "bcrypt": 12}
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when the hashing pool's queue is full."""
+
+
+def _werkzeug_method(scheme, cost):
+    if scheme == "scrypt":
+        return f"scrypt:{cost}:8:1"
+    return f"pbkdf2:sha256:{cost}"
+
+
+def _hash(scheme, cost, password):
+    if scheme == "bcrypt":
+        return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds=cost)).decode("ascii")
+    return generate_password_hash(password, method=_werkzeug_method(scheme, cost))
+
+
+def _verify(password_hash, password):
+    if password_hash.startswith("$2"):
+        return bcrypt.checkpw(password.encode("utf-8"), password_hash.encode("ascii"))
+    return check_password_hash(password_hash, password)
+
+
+class PasswordHasher:
+    """Password hashing with a configurable algorithm and cost.
+
+    With ``workers`` > 0 the key derivation runs in a process pool so it
+    does not hold the GIL of the worker serving requests; at most
+    ``max_pending`` hashes may be queued or running, beyond which
+    :class:`PasswordHasherBusy` is raised after ``queue_timeout`` seconds.
+    Hashes produced by any supported scheme can be verified, so the
+    scheme or cost can change without locking existing users out.
+    """
+
+    def __init__(self, scheme="scrypt", cost=None, workers=0, max_pending=None, queue_timeout=5.0):
+        if scheme not in SCHEMES:
+            raise ValueError(f"Unknown password hash scheme: {scheme}")
+        self.scheme = scheme
+        self.cost = cost or DEFAULT_COSTS[scheme]
+        self.workers = workers
+        self.queue_timeout = queue_timeout
+        self._slots = threading.BoundedSemaphore(max_pending or max(workers, 1) * 4)
+        self._pool = None
+        self._pool_lock = threading.Lock()
+
+    def hash(self, password):
+        return self._run(_hash, self.scheme, self.cost, password)
+
+    def verify(self, password_hash, password):
+        return self._run(_verify, password_hash, password)
+
+    def needs_rehash(self, password_hash):
+        """True if ``password_hash`` was made with a different scheme or cost."""
+        if password_hash.startswith("$2"):
+            return self.scheme != "bcrypt" or int(password_hash.split("$")[2]) != self.cost
+        if self.scheme == "bcrypt":
+            return True
+        return password_hash.split("$", 1)[0] != _werkzeug_method(self.scheme, self.cost)
+
+    def _run(self, func, *args):
+        if not self.workers:
+            return func(*args)
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            raise PasswordHasherBusy()
+        try:
+            return self._get_pool().submit(func, *args).result()
+        finally:
+            self._slots.release()
+
+    def _get_pool(self):
+        # Created lazily so each gunicorn worker gets its own pool after fork.
+        with self._pool_lock:
+            if self._pool is None:
+                # A forked child would inherit locks held by this worker's other
+                # threads; start children from a forkserver instead.
+                self._pool = ProcessPoolExecutor(max_workers=self.workers,
+                                                 mp_context=multiprocessing.get_context("forkserver"))
+                atexit.register(self._pool.shutdown, wait=False, cancel_futures=True)
+            return self._pool
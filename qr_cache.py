@@ -0,0 +1,180 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+
+class QRCache:
+    """Bounded LRU cache of encoded QR images, keyed by the QR payload.
+
+    Each payload may have several rendered ``variant``s (format, size, ...);
+    all of them are dropped together by :meth:`invalidate`. Default-variant
+    entries evicted from memory spill over to ``disk_dir`` when one is set,
+    and move back into memory on the next hit. The spill directory keeps
+    about ``disk_max_entries`` files, dropping the least recently written.
+    Other variants are cheap to ask for in bulk, so they are never spilled.
+    ``namespace`` should
+    capture anything that changes every payload at once (e.g. ``API_URL``):
+    when it differs from the one recorded on disk the spill directory is
+    wiped.
+    """
+
+    def __init__(self, max_entries=256, disk_dir=None, namespace="", disk_max_entries=10000):
+        self.max_entries = max_entries
+        self.disk_dir = disk_dir
+        self.disk_max_entries = disk_max_entries
+        self.namespace = namespace
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_writes = 0
+        self.hits = 0
+        self.misses = 0
+
+        if self.disk_dir:
+            os.makedirs(self.disk_dir, exist_ok=True)
+            self._check_namespace()
+            self._sweep_disk()
+
+    @staticmethod
+    def key_for(payload, variant=""):
+        key = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+        if variant:
+            key += "-" + hashlib.sha256(variant.encode("utf-8")).hexdigest()[:16]
+        return key
+
+    def get(self, payload, variant=""):
+        key = self.key_for(payload, variant)
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return data
+
+        data = self._read_disk(key) if not variant else None
+        with self._lock:
+            if data is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        # Promoted: memory holds it now, and it is written back if evicted again.
+        self._remove_disk(key)
+        self._store(key, data)
+        return data
+
+    def put(self, payload, data, variant=""):
+        self._store(self.key_for(payload, variant), data)
+
+    def get_or_render(self, payload, render, variant=""):
+        """Return cached bytes for ``payload``, calling ``render(payload)`` on a miss."""
+        data = self.get(payload, variant)
+        if data is None:
+            data = render(payload)
+            self.put(payload, data, variant)
+        return data
+
+    def invalidate(self, payload):
+        prefix = self.key_for(payload)
+        with self._lock:
+            stale = [key for key in self._entries if key.startswith(prefix)]
+            for key in stale:
+                del self._entries[key]
+        if self.disk_dir:
+            for name in os.listdir(self.disk_dir):
+                if name.startswith(prefix) and name.endswith(".bin"):
+                    self._remove_disk(name[:-4])
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        if self.disk_dir:
+            for name in os.listdir(self.disk_dir):
+                if name.endswith(".bin"):
+                    self._remove_disk(name[:-4])
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), "max_entries": self.max_entries,
+                    "hits": self.hits, "misses": self.misses}
+
+    # --------------------------------
+    # internals
+    # --------------------------------
+
+    def _store(self, key, data):
+        evicted = []
+        with self._lock:
+            self._entries[key] = data
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                evicted.append(self._entries.popitem(last=False))
+        for old_key, old_data in evicted:
+            if "-" not in old_key:
+                self._write_disk(old_key, old_data)
+
+    def _path(self, key):
+        return os.path.join(self.disk_dir, f"{key}.bin")
+
+    def _read_disk(self, key):
+        if not self.disk_dir:
+            return None
+        try:
+            with open(self._path(key), "rb") as fh:
+                return fh.read()
+        except OSError:
+            return None
+
+    def _write_disk(self, key, data):
+        if not self.disk_dir:
+            return
+        tmp_path = f"{self._path(key)}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "wb") as fh:
+                fh.write(data)
+            os.replace(tmp_path, self._path(key))
+        except OSError:
+            return
+        # Sweep every tenth of the cap, so the directory overshoots by at most that much.
+        self._disk_writes += 1
+        if self._disk_writes >= max(1, self.disk_max_entries // 10):
+            self._disk_writes = 0
+            self._sweep_disk()
+
+    def _sweep_disk(self):
+        """Remove the oldest spilled files beyond ``disk_max_entries``."""
+        files = []
+        try:
+            with os.scandir(self.disk_dir) as entries:
+                for entry in entries:
+                    if entry.name.endswith(".bin"):
+                        try:
+                            files.append((entry.stat().st_mtime, entry.name[:-4]))
+                        except OSError:
+                            pass
+        except OSError:
+            return
+        excess = len(files) - self.disk_max_entries
+        if excess > 0:
+            for _, key in sorted(files)[:excess]:
+                self._remove_disk(key)
+
+    def _remove_disk(self, key):
+        if not self.disk_dir:
+            return
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def _check_namespace(self):
+        marker = os.path.join(self.disk_dir, "NAMESPACE")
+        try:
+            with open(marker) as fh:
+                current = fh.read()
+        except OSError:
+            current = None
+
+        if current != self.namespace:
+            self.clear()
+            with open(marker, "w") as fh:
+                fh.write(self.namespace)
@@ -0,0 +1,143 @@
+import atexit
+import io
+import math
+import multiprocessing
+import os
+import threading
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+
+FORMATS = {"png": "image/png", "svg": "image/svg+xml"}
+
+ERROR_CORRECTION = ("L", "M", "Q", "H")
+
+# Same defaults as qrcode.make()
+DEFAULT_OPTIONS = {"format": "png", "box_size": 10, "border": 4, "error_correction": "M"}
+
+# Batches smaller than this are rendered inline; the IPC round trip to the
+# pool costs more than encoding a handful of images.
+INLINE_BATCH_SIZE = 4
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def build_qr(payload, box_size=10, border=4, error_correction="M"):
+    """Encoded ``qrcode.QRCode`` for ``payload``, sized to the smallest version that fits."""
+    # Imported on first use: qrcode (and Pillow behind it) is only needed by
+    # workers that actually render, not at app startup.
+    import qrcode
+
+    qr = qrcode.QRCode(error_correction=getattr(qrcode.constants, f"ERROR_CORRECT_{error_correction}"),
+                       box_size=box_size, border=border)
+    qr.add_data(payload)
+    qr.make(fit=True)
+    return qr
+
+
+def render(payload, format="png", box_size=10, border=4, error_correction="M"):
+    """Encode ``payload`` as PNG or SVG bytes.
+
+    The SVG path writes XML directly through qrcode's path image factory and
+    never calls into Pillow.
+    """
+    qr = build_qr(payload, box_size=box_size, border=border, error_correction=error_correction)
+
+    img_io = io.BytesIO()
+    if format == "svg":
+        from qrcode.image.svg import SvgPathImage
+
+        qr.make_image(image_factory=SvgPathImage).save(img_io)
+    else:
+        qr.make_image().save(img_io, 'PNG')
+    return img_io.getvalue()
+
+
+def options_variant(options):
+    """Cache variant string for ``options``; empty for the defaults."""
+    if options == DEFAULT_OPTIONS:
+        return ""
+    return ",".join(f"{key}={options[key]}" for key in sorted(options))
+
+
+def _get_pool(max_workers=None):
+    # Created lazily so each gunicorn worker gets its own pool after fork.
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # Forking this process would copy locks held by its other threads
+            # (live feed bridge, leaderboard reloads, gevent hub) into the
+            # children; start them from a clean forkserver instead.
+            _pool = ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("forkserver"))
+            atexit.register(_pool.shutdown, wait=False, cancel_futures=True)
+        return _pool
+
+
+def render_many(payloads, max_workers=None):
+    """Yield PNG bytes for each payload, in order, encoding across processes."""
+    payloads = list(payloads)
+    if len(payloads) < INLINE_BATCH_SIZE:
+        for payload in payloads:
+            yield render(payload)
+        return
+
+    pool = _get_pool(max_workers)
+    workers = max_workers or os.cpu_count() or 1
+    chunksize = max(1, len(payloads) // (workers * 4))
+    yield from pool.map(render, payloads, chunksize=chunksize)
+
+
+class _StreamBuffer(io.RawIOBase):
+    """Write-only, unseekable sink that lets ZipFile emit data incrementally."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self):
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def stream_zip(named_images):
+    """Yield a ZIP archive chunk by chunk from ``(filename, bytes)`` pairs."""
+    buffer = _StreamBuffer()
+    # PNG data is already deflated, so store entries as-is.
+    with zipfile.ZipFile(buffer, mode='w', compression=zipfile.ZIP_STORED) as archive:
+        for name, data in named_images:
+            archive.writestr(name, data)
+            chunk = buffer.drain()
+            if chunk:
+                yield chunk
+    chunk = buffer.drain()
+    if chunk:
+        yield chunk
+
+
+def sprite_sheet(images, columns=None):
+    """Tile PNG images into a single grid PNG; returns ``(png, columns, cell_size)``."""
+    from PIL import Image
+
+    decoded = [Image.open(io.BytesIO(data)) for data in images]
+    if not decoded:
+        raise ValueError("No images to tile")
+
+    columns = columns or math.ceil(math.sqrt(len(decoded)))
+    rows = math.ceil(len(decoded) / columns)
+    cell = max(max(img.width, img.height) for img in decoded)
+
+    sheet = Image.new('1', (columns * cell, rows * cell), 1)
+    for index, img in enumerate(decoded):
+        row, col = divmod(index, columns)
+        sheet.paste(img, (col * cell, row * cell))
+
+    img_io = io.BytesIO()
+    sheet.save(img_io, 'PNG', optimize=True)
+    return img_io.getvalue(), columns, cell
@@ -0,0 +1,132 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+from itertools import islice
+
+
+def parse_limit(spec):
+    """Parse ``"<requests>/<seconds>"`` into ``(rate per second, burst capacity)``."""
+    requests, seconds = spec.split("/")
+    requests, seconds = int(requests), float(seconds)
+    if requests <= 0 or seconds <= 0:
+        raise ValueError(f"Invalid rate limit: {spec}")
+    return requests / seconds, requests
+
+
+class MemoryBucketStore:
+    """Token buckets held in this process only.
+
+    Buckets are kept in least-recently-used order. Once there are more than
+    ``max_keys``, each ``take`` examines at most ``prune_batch`` of the oldest
+    and drops those that have refilled; if none has, the oldest is evicted
+    anyway, so the store stays bounded without ever scanning all of it.
+    """
+
+    def __init__(self, max_keys=100000, prune_batch=8):
+        self.max_keys = max_keys
+        self.prune_batch = prune_batch
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key, rate, capacity, cost=1):
+        """Spend ``cost`` tokens from ``key``'s bucket; returns ``(allowed, retry_after_seconds)``.
+
+        ``cost=0`` only checks that a token is left, without spending it.
+        """
+        now = time.monotonic()
+        needed = max(cost, 1)
+        with self._lock:
+            tokens, updated, _, _ = self._buckets.get(key, (capacity, now, rate, capacity))
+            tokens = min(capacity, tokens + (now - updated) * rate)
+            if tokens >= needed:
+                tokens -= cost
+                allowed, retry_after = True, 0.0
+            else:
+                allowed, retry_after = False, (needed - tokens) / rate
+            self._buckets[key] = (tokens, now, rate, capacity)
+            self._buckets.move_to_end(key)
+            if len(self._buckets) > self.max_keys:
+                self._prune(now)
+        return allowed, retry_after
+
+    def _prune(self, now):
+        # A bucket that has refilled completely is the same as no bucket.
+        refilled = [key for key, (tokens, updated, rate, capacity) in islice(self._buckets.items(), self.prune_batch)
+                    if tokens + (now - updated) * rate >= capacity]
+        for key in refilled:
+            del self._buckets[key]
+        if len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+
+
+_TAKE_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local cost = tonumber(ARGV[4])
+local needed = math.max(cost, 1)
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+local retry_after = 0
+if tokens >= needed then
+    tokens = tokens - cost
+    allowed = 1
+else
+    retry_after = (needed - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return {allowed, tostring(retry_after)}
+"""
+
+
+class RedisBucketStore:
+    """Token buckets shared by every worker, updated atomically by a Lua script.
+
+    ``client`` is anything with the redis-py API (redis.Redis,
+    fakeredis.FakeRedis with Lua support, ...).
+    """
+
+    def __init__(self, client, prefix="trakzone:ratelimit:"):
+        self.prefix = prefix
+        self._take = client.register_script(_TAKE_SCRIPT)
+
+    def take(self, key, rate, capacity, cost=1):
+        allowed, retry_after = self._take(keys=[self.prefix + key], args=[rate, capacity, time.time(), cost])
+        return bool(int(allowed)), float(retry_after)
+
+
+class RateLimiter:
+    """Named token-bucket limits over a bucket store."""
+
+    def __init__(self, store, limits):
+        self.store = store
+        self.limits = {name: parse_limit(spec) for name, spec in limits.items() if spec}
+
+    def hit(self, name, key, cost=1):
+        """Record one request for ``key`` under limit ``name``; returns seconds to wait, or 0.
+
+        With ``cost=0`` the request is checked against the limit but not counted.
+        """
+        if name not in self.limits or key is None:
+            return 0
+        rate, capacity = self.limits[name]
+        allowed, retry_after = self.store.take(f"{name}:{key}", rate, capacity, cost)
+        return 0 if allowed else max(1, math.ceil(retry_after))
+
+
+def create_bucket_store(backend, redis_url=None):
+    """Build the store named by ``backend`` ("memory" or "redis")."""
+    if backend == "redis":
+        try:
+            import redis
+        except ImportError as exc:
+            raise RuntimeError("RATELIMIT_STORE=redis requires the 'redis' package") from exc
+        return RedisBucketStore(redis.Redis.from_url(redis_url))
+    if backend == "memory":
+        return MemoryBucketStore()
+    raise ValueError(f"Unknown rate limit store: {backend}")
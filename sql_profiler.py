@@ -0,0 +1,116 @@
+import logging
+import re
+import threading
+import time
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+_IN_LIST = re.compile(r"\bIN\s*\((?:\s*(?:\?|%s|%\(\w+\)s|:\w+|\$\d+)\s*,?)+\)", re.IGNORECASE)
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement):
+    """``statement`` with literals and IN lists collapsed, so repeated lookups compare equal."""
+    shape = _IN_LIST.sub("IN (...)", statement)
+    shape = _LITERAL.sub("?", shape)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+
+class RequestProfile:
+    """Statements executed while serving one request."""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.shapes = {}
+        self.slow = []
+
+    def add(self, statement, seconds):
+        self.count += 1
+        self.seconds += seconds
+        shape = statement_shape(statement)
+        count, total = self.shapes.get(shape, (0, 0.0))
+        self.shapes[shape] = (count + 1, total + seconds)
+
+    def repeated(self, threshold):
+        return [{"statement": shape, "count": count, "total_ms": round(total * 1000, 3)}
+                for shape, (count, total) in self.shapes.items() if count >= threshold]
+
+
+class QueryProfiler:
+    """Per-request SQL profiling for development and staging.
+
+    Counts statements per request, flags statement shapes repeated at least
+    ``repeat_threshold`` times (the usual sign of an N+1 lazy load), and
+    for SELECTs slower than ``slow_ms`` records the query plan: EXPLAIN
+    ANALYZE on Postgres (which runs the query a second time) or EXPLAIN
+    QUERY PLAN on SQLite. The last ``report_size`` request summaries are
+    kept for :meth:`report`.
+    """
+
+    def __init__(self, slow_ms=100.0, explain=False, repeat_threshold=5, report_size=200):
+        self.slow_seconds = slow_ms / 1000
+        self.explain = explain
+        self.repeat_threshold = repeat_threshold
+        self._recent = deque(maxlen=report_size)
+        self._lock = threading.Lock()
+
+    def before_execute(self, context):
+        context.profiler_started = time.perf_counter()
+
+    def after_execute(self, profile, conn, cursor, statement, parameters, context, executemany):
+        seconds = time.perf_counter() - context.profiler_started
+        profile.add(statement, seconds)
+        if seconds >= self.slow_seconds:
+            slow = {"statement": statement_shape(statement), "duration_ms": round(seconds * 1000, 3)}
+            if self.explain and not executemany and statement.lstrip()[:6].upper() == "SELECT":
+                slow["plan"] = self._explain(conn, statement, parameters)
+            profile.slow.append(slow)
+
+    def _explain(self, conn, statement, parameters):
+        prefix = "EXPLAIN QUERY PLAN " if conn.dialect.name == "sqlite" else "EXPLAIN ANALYZE "
+        # A raw DB-API cursor, so the EXPLAIN is not itself profiled.
+        cursor = conn.connection.cursor()
+        try:
+            cursor.execute(prefix + statement, parameters)
+            return [" ".join(str(column) for column in row) for row in cursor.fetchall()]
+        except Exception as exc:
+            return [f"EXPLAIN failed: {exc}"]
+        finally:
+            cursor.close()
+
+    def finish(self, profile, method, path, endpoint):
+        """Record ``profile`` in the rolling report and return its summary."""
+        summary = {
+            "method": method,
+            "path": path,
+            "endpoint": endpoint,
+            "queries": profile.count,
+            "duration_ms": round(profile.seconds * 1000, 3),
+            "repeated": profile.repeated(self.repeat_threshold),
+            "slow": profile.slow,
+        }
+        for repeated in summary["repeated"]:
+            logger.warning("Possible N+1 in %s %s: %d x %s", method, path, repeated["count"], repeated["statement"])
+        with self._lock:
+            self._recent.append(summary)
+        return summary
+
+    def report(self):
+        """Recent requests plus the repeated statement shapes across them, worst first."""
+        with self._lock:
+            recent = list(self._recent)
+        shapes = {}
+        for summary in recent:
+            for repeated in summary["repeated"]:
+                entry = shapes.setdefault((summary["endpoint"], repeated["statement"]),
+                                          {"endpoint": summary["endpoint"], "statement": repeated["statement"],
+                                           "requests": 0, "max_count": 0})
+                entry["requests"] += 1
+                entry["max_count"] = max(entry["max_count"], repeated["count"])
+        return {
+            "requests": recent,
+            "n_plus_one": sorted(shapes.values(), key=lambda entry: (-entry["requests"], -entry["max_count"])),
+        }
@@ -0,0 +1,38 @@
+import os
+import tempfile
+
+import pytest
+
+# Settings are read from the environment when the app is imported.
+_db_dir = tempfile.mkdtemp(prefix="trakzone-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'test.db')}"
+os.environ["DATABASE_REPLICA_URLS"] = ""
+os.environ["SCANNER_API_KEYS"] = "test-scanner-key"
+os.environ["LEADERBOARD_STORE"] = "sql"
+
+
+@pytest.fixture
+def app():
+    from app import app
+    from extensions import db, rate_limiter
+    from ratelimit import MemoryBucketStore
+
+    rate_limiter.store = MemoryBucketStore()
+    with app.app_context():
+        db.create_all(bind_key=None)
+    yield app
+    with app.app_context():
+        db.session.remove()
+        db.drop_all(bind_key=None)
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def auth_headers(client):
+    client.post("/register", json={"username": "scanner", "email": "scanner@example.com", "password": "pw"})
+    token = client.post("/login", json={"username": "scanner", "password": "pw"}).json["access_token"]
+    return {"Authorization": f"Bearer {token}"}
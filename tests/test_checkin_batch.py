@@ -0,0 +1,109 @@
+from datetime import datetime
+
+import pytest
+
+from extensions import db
+from models import CheckIn, Event, User
+
+SCANNER = {"X-Scanner-Key": "test-scanner-key"}
+
+
+@pytest.fixture
+def ids(app, auth_headers):
+    """Two more users and two events next to the logged-in scanner user."""
+    with app.app_context():
+        users = [User(username=f"u{i}", email=f"u{i}@example.com", password_hash="x") for i in range(2)]
+        events = [Event(name=f"e{i}", date=datetime(2025, 4, 1)) for i in range(2)]
+        db.session.add_all(users + events)
+        db.session.commit()
+        return [user.id for user in users], [event.id for event in events]
+
+
+def post_batch(client, auth_headers, records, scanner=SCANNER):
+    return client.post("/checkin/batch", json={"checkins": records}, headers=dict(auth_headers, **scanner))
+
+
+def stored_checkins(app):
+    with app.app_context():
+        return {(row.user_id, row.event_id): row.timestamp for row in db.session.scalars(db.select(CheckIn))}
+
+
+def scan(user_id, event_id, scanned_at="2025-04-01 10:00:00"):
+    return {"user_id": user_id, "event_id": event_id, "scanned_at": scanned_at}
+
+
+def test_statuses(app, client, auth_headers, ids):
+    (u1, u2), (e1, e2) = ids
+    assert post_batch(client, auth_headers, [scan(u1, e1)]).json["summary"] == {"created": 1}
+
+    response = post_batch(client, auth_headers, [
+        scan(u1, e1),
+        scan(u2, e1),
+        scan(u2, e2),
+        scan(u2, 999),
+        scan(999, e1),
+        {"user_id": u1, "event_id": e2, "scanned_at": "yesterday"},
+        {"user_id": True, "event_id": e1, "scanned_at": "2025-04-01 10:00:00"},
+        {"user_id": u1, "event_id": "1", "scanned_at": "2025-04-01 10:00:00"},
+        "not a record",
+    ])
+
+    assert response.status_code == 200
+    assert [result["status"] for result in response.json["results"]] == [
+        "duplicate", "created", "created", "not_found", "not_found", "invalid", "invalid", "invalid", "invalid"]
+    assert response.json["summary"] == {"created": 2, "duplicate": 1, "not_found": 2, "invalid": 4}
+    assert set(stored_checkins(app)) == {(u1, e1), (u2, e1), (u2, e2)}
+
+
+def test_earliest_scan_wins(app, client, auth_headers, ids):
+    (u1, _), (e1, _) = ids
+    response = post_batch(client, auth_headers, [
+        scan(u1, e1, "2025-04-01 10:30:00"),
+        scan(u1, e1, "2025-04-01 10:00:00"),
+        scan(u1, e1, "2025-04-01 11:00:00"),
+    ])
+
+    assert [result["status"] for result in response.json["results"]] == ["duplicate", "created", "duplicate"]
+    assert stored_checkins(app)[(u1, e1)] == datetime(2025, 4, 1, 10, 0)
+
+
+def test_timezone_aware_scans_are_stored_as_utc(app, client, auth_headers, ids):
+    (u1, u2), (e1, _) = ids
+    response = post_batch(client, auth_headers, [
+        scan(u1, e1, "2025-04-01T10:00:00+02:00"),
+        scan(u2, e1, "2025-04-01T10:00:00Z"),
+    ])
+
+    assert response.json["summary"] == {"created": 2}
+    stored = stored_checkins(app)
+    assert stored[(u1, e1)] == datetime(2025, 4, 1, 8, 0)
+    assert stored[(u2, e1)] == datetime(2025, 4, 1, 10, 0)
+
+
+def test_counts_feed_the_leaderboard(app, client, auth_headers, ids):
+    (u1, _), (e1, e2) = ids
+    post_batch(client, auth_headers, [scan(u1, e1), scan(u1, e2), scan(u1, e2)])
+
+    response = client.get(f"/leaderboard/users/{u1}")
+    assert response.json["checkins"] == 2
+
+
+@pytest.mark.parametrize("scanner", [{}, {"X-Scanner-Key": "wrong"}])
+def test_requires_scanner_key(app, client, auth_headers, ids, scanner):
+    (u1, _), (e1, _) = ids
+    response = post_batch(client, auth_headers, [scan(u1, e1)], scanner=scanner)
+
+    assert response.status_code == 403
+    assert stored_checkins(app) == {}
+
+
+def test_rejects_bad_payloads(app, client, auth_headers, ids):
+    (u1, _), (e1, _) = ids
+    assert post_batch(client, auth_headers, []).status_code == 400
+    assert client.post("/checkin/batch", json={"checkins": "x"}, headers=dict(auth_headers, **SCANNER)).status_code == 400
+
+    app.config["CHECKIN_BATCH_MAX"], limit = 2, app.config["CHECKIN_BATCH_MAX"]
+    try:
+        assert post_batch(client, auth_headers, [scan(u1, e1)] * 3).status_code == 400
+    finally:
+        app.config["CHECKIN_BATCH_MAX"] = limit
@@ -0,0 +1,211 @@
+"""Behaviour shared by the leaderboard stores; the Redis store runs against fakeredis."""
+import random
+import threading
+import time
+
+import pytest
+
+from leaderboard_store import (IndexableSkipList, MemoryLeaderboardStore, RedisLeaderboardStore,
+                               SortedScoreSet, UsernameCache)
+
+
+def memory_store():
+    return MemoryLeaderboardStore(ttl=0)
+
+
+def redis_store():
+    fakeredis = pytest.importorskip("fakeredis")
+    return RedisLeaderboardStore(fakeredis.FakeRedis())
+
+
+@pytest.fixture(params=[memory_store, redis_store], ids=["memory", "redis"])
+def store(request):
+    return request.param()
+
+
+def test_incr_returns_new_score(store):
+    assert store.incr("all", 1, 1) == 1
+    assert store.incr("all", 1, 2) == 3
+    assert store.incr("week:2025-W14", 1, 1) == 1
+
+
+def test_top_orders_by_score(store):
+    store.replace({"all": {1: 5, 2: 9, 3: 1, 4: 7}})
+    assert store.top("all", 3) == [(2, 9), (4, 7), (1, 5)]
+    assert store.top("all", 10)[-1] == (3, 1)
+    assert store.top("missing", 3) == []
+
+
+def test_rank_shares_ties_and_counts_missing_as_zero(store):
+    store.replace({"all": {1: 5, 2: 9, 3: 5, 4: 1}})
+    assert store.rank("all", 2) == (1, 9)
+    assert store.rank("all", 1) == (2, 5)
+    assert store.rank("all", 3) == (2, 5)
+    assert store.rank("all", 4) == (4, 1)
+    assert store.rank("all", 99) == (5, 0)
+    assert store.rank("missing", 1) == (1, 0)
+
+
+def test_incr_moves_member(store):
+    store.replace({"all": {1: 5, 2: 3}})
+    store.incr("all", 2, 4)
+    assert store.top("all", 2) == [(2, 7), (1, 5)]
+    assert store.rank("all", 1) == (2, 5)
+
+
+def test_replace_drops_previous_members(store):
+    store.replace({"all": {1: 5, 2: 3}})
+    store.replace({"all": {3: 1}})
+    assert store.top("all", 10) == [(3, 1)]
+
+
+def test_refresh_loads_on_first_use_and_after_invalidate(store):
+    loads = []
+
+    def load():
+        loads.append(1)
+        return {"all": {1: len(loads)}}
+
+    store.refresh(load)
+    store.refresh(load)
+    assert len(loads) == 1
+    assert store.top("all", 1) == [(1, 1)]
+
+    store.invalidate()
+    store.refresh(load)
+    for _ in range(100):
+        if store.top("all", 1) == [(1, 2)]:
+            break
+        time.sleep(0.01)
+    assert len(loads) == 2
+    assert store.top("all", 1) == [(1, 2)]
+
+
+def test_redis_store_rebuilds_once_across_workers():
+    fakeredis = pytest.importorskip("fakeredis")
+    client = fakeredis.FakeRedis()
+    loads = []
+
+    def load():
+        loads.append(1)
+        return {"all": {1: 3}}
+
+    first, second = RedisLeaderboardStore(client), RedisLeaderboardStore(client)
+    first.refresh(load)
+    second.refresh(load)
+    assert len(loads) == 1
+    assert second.top("all", 1) == [(1, 3)]
+
+
+def test_memory_reload_runs_in_background_one_at_a_time():
+    store = MemoryLeaderboardStore(ttl=0.01)
+    store.refresh(lambda: {"all": {1: 1}})
+    release = threading.Event()
+    loads = []
+
+    def slow_load():
+        loads.append(1)
+        release.wait(5)
+        return {"all": {1: 2}}
+
+    time.sleep(0.02)
+    for _ in range(5):
+        store.refresh(slow_load)
+        # Readers keep the current boards while the reload is running.
+        assert store.top("all", 1) == [(1, 1)]
+    release.set()
+    for _ in range(100):
+        if store.top("all", 1) == [(1, 2)]:
+            break
+        time.sleep(0.01)
+    assert len(loads) == 1
+    assert store.top("all", 1) == [(1, 2)]
+
+
+def test_memory_first_load_blocks_concurrent_readers():
+    store = MemoryLeaderboardStore(ttl=0)
+    loads = []
+
+    def load():
+        loads.append(1)
+        time.sleep(0.05)
+        return {"all": {1: 1}}
+
+    results = []
+
+    def read():
+        store.refresh(load)
+        results.append(store.top("all", 1))
+
+    threads = [threading.Thread(target=read) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(loads) == 1
+    assert results == [[(1, 1)]] * 4
+
+
+def test_skiplist_from_sorted_matches_inserts():
+    rng = random.Random(7)
+    keys = rng.sample(range(100000), 2000)
+    built = IndexableSkipList.from_sorted(sorted(keys))
+    inserted = IndexableSkipList()
+    for key in keys:
+        inserted.insert(key)
+
+    assert list(built) == list(inserted) == sorted(keys)
+    for probe in rng.sample(range(100001), 200):
+        assert built.bisect_left(probe) == inserted.bisect_left(probe)
+
+    for key in keys[:500]:
+        built.remove(key)
+    built.insert(-1)
+    remaining = sorted(keys[500:] + [-1])
+    assert list(built) == remaining
+    assert len(built) == len(remaining)
+    for probe in rng.sample(range(100001), 200):
+        assert built.bisect_left(probe) == sum(1 for key in remaining if key < probe)
+
+
+def test_sorted_score_set_bulk_build():
+    scores = {member: member % 7 for member in range(1, 50)}
+    board = SortedScoreSet(scores)
+    assert len(board) == 49
+    assert board.top(3) == [(6, 6), (13, 6), (20, 6)]
+    assert board.count_above(5) == 7
+    assert board.incr(1, 10) == 11
+    assert board.top(1) == [(1, 11)]
+
+
+def test_username_cache_loads_only_misses_and_evicts_least_recent():
+    loads = []
+
+    def load(user_ids):
+        loads.append(list(user_ids))
+        return {user_id: f"user{user_id}" for user_id in user_ids if user_id != 404}
+
+    cache = UsernameCache(max_entries=2, ttl=0)
+    assert cache.get_many([1, 2], load) == {1: "user1", 2: "user2"}
+    assert cache.get_many([1, 404], load) == {1: "user1", 404: None}
+    assert loads == [[1, 2], [404]]
+
+    cache.get_many([3], load)  # evicts 2, the least recently used
+    loads.clear()
+    cache.get_many([1, 2, 3], load)
+    assert loads == [[2]]
+
+
+def test_username_cache_expires_and_invalidates():
+    names = {1: "alice"}
+    cache = UsernameCache(ttl=0.05)
+    assert cache.get_many([1], lambda ids: {i: names[i] for i in ids}) == {1: "alice"}
+
+    names[1] = "alicia"
+    cache.invalidate(1)
+    assert cache.get_many([1], lambda ids: {i: names[i] for i in ids}) == {1: "alicia"}
+
+    names[1] = "ali"
+    assert cache.get_many([1], lambda ids: {i: names[i] for i in ids}) == {1: "alicia"}
+    time.sleep(0.06)
+    assert cache.get_many([1], lambda ids: {i: names[i] for i in ids}) == {1: "ali"}
@@ -0,0 +1,68 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+import checkins
+from extensions import db
+from models import Event, MetricCounter, User, bump_metrics
+
+SCANNER = {"X-Scanner-Key": "test-scanner-key"}
+
+
+@pytest.fixture
+def event_id(app):
+    with app.app_context():
+        event = Event(name="e", date=datetime(2025, 4, 1))
+        db.session.add(event)
+        db.session.commit()
+        return event.id
+
+
+def minute_key(delta):
+    return (datetime.utcnow() + delta).strftime("%Y-%m-%d %H:%M")
+
+
+def minute_keys(app):
+    with app.app_context():
+        return set(db.session.scalars(db.select(MetricCounter.key).where(MetricCounter.kind == "minute")))
+
+
+def test_checkin_sweeps_minutes_outside_the_window(app, client, auth_headers, event_id, monkeypatch):
+    stale, recent = minute_key(timedelta(hours=-3)), minute_key(timedelta(minutes=-5))
+    with app.app_context():
+        bump_metrics({("minute", stale): 4, ("minute", recent): 2})
+        db.session.commit()
+    monkeypatch.setattr(checkins, "minutes_pruned_at", None)
+
+    assert client.post("/checkin", json={"event_id": event_id}, headers=auth_headers).status_code == 201
+
+    keys = minute_keys(app)
+    assert stale not in keys and recent in keys
+
+
+def test_sweep_runs_once_per_interval(app, client, auth_headers, event_id, monkeypatch):
+    monkeypatch.setattr(checkins, "minutes_pruned_at", None)
+    client.post("/checkin", json={"event_id": event_id}, headers=auth_headers)
+    stale = minute_key(timedelta(hours=-3))
+    with app.app_context():
+        bump_metrics({("minute", stale): 1})
+        db.session.commit()
+        checkins.prune_metric_minutes_if_due()
+
+    assert stale in minute_keys(app)
+
+
+def test_late_offline_scans_skip_the_minute_counter(app, client, auth_headers, event_id):
+    with app.app_context():
+        user_id = db.session.scalar(db.select(User.id).where(User.username == "scanner"))
+    old_scan = {"user_id": user_id, "event_id": event_id, "scanned_at": "2025-04-01T10:00:00+00:00"}
+    response = client.post("/checkin/batch", json={"checkins": [old_scan]}, headers=dict(auth_headers, **SCANNER))
+
+    assert response.json["summary"] == {"created": 1}
+    assert minute_keys(app) == set()
+    with app.app_context():
+        event_total = db.session.scalar(
+            db.select(db.func.sum(MetricCounter.value))
+            .where(MetricCounter.kind == "event", MetricCounter.key == str(event_id))
+        )
+    assert event_total == 1
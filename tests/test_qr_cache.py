@@ -0,0 +1,66 @@
+import os
+
+from qr_cache import QRCache
+
+
+def spilled(cache):
+    return sorted(name for name in os.listdir(cache.disk_dir) if name.endswith(".bin"))
+
+
+def test_memory_lru(tmp_path):
+    cache = QRCache(max_entries=2)
+    cache.put("a", b"A")
+    cache.put("b", b"B")
+    assert cache.get("a") == b"A"
+    cache.put("c", b"C")
+    assert cache.get("b") is None
+    assert cache.get("a") == b"A"
+    assert cache.stats()["entries"] == 2
+
+
+def test_evicted_entries_spill_and_move_back(tmp_path):
+    cache = QRCache(max_entries=1, disk_dir=str(tmp_path))
+    cache.put("a", b"A")
+    cache.put("b", b"B")
+    assert spilled(cache) == [QRCache.key_for("a") + ".bin"]
+
+    assert cache.get("a") == b"A"
+    # "a" is back in memory and "b" took its place on disk.
+    assert spilled(cache) == [QRCache.key_for("b") + ".bin"]
+
+
+def test_variants_are_not_spilled(tmp_path):
+    cache = QRCache(max_entries=1, disk_dir=str(tmp_path))
+    cache.put("a", b"A-svg", variant="format=svg")
+    cache.put("b", b"B")
+    assert spilled(cache) == []
+    assert cache.get("a", variant="format=svg") is None
+
+
+def test_spill_directory_is_capped(tmp_path):
+    cache = QRCache(max_entries=1, disk_dir=str(tmp_path), disk_max_entries=20)
+    for i in range(200):
+        cache.put(f"payload-{i}", b"x")
+        assert len(spilled(cache)) <= 22
+
+
+def test_existing_directory_is_trimmed_on_start(tmp_path):
+    cache = QRCache(max_entries=1, disk_dir=str(tmp_path), disk_max_entries=100)
+    for i in range(60):
+        cache.put(f"payload-{i}", b"x")
+    assert len(spilled(cache)) == 59
+
+    restarted = QRCache(disk_dir=str(tmp_path), disk_max_entries=10)
+    assert len(spilled(restarted)) == 10
+
+
+def test_invalidate_drops_every_variant(tmp_path):
+    cache = QRCache(max_entries=2, disk_dir=str(tmp_path))
+    cache.put("a", b"A")
+    cache.put("a", b"A-svg", variant="format=svg")
+    cache.put("b", b"B")
+    cache.put("c", b"C")
+    cache.invalidate("a")
+    assert cache.get("a") is None
+    assert cache.get("a", variant="format=svg") is None
+    assert spilled(cache) == []
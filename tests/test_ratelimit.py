@@ -0,0 +1,120 @@
+"""Token-bucket behaviour of both stores; the Redis store runs its Lua script under fakeredis."""
+import pytest
+
+import ratelimit
+from ratelimit import MemoryBucketStore, RateLimiter, RedisBucketStore, parse_limit
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(ratelimit, "time", clock)
+    return clock
+
+
+def memory_store():
+    return MemoryBucketStore()
+
+
+def redis_store():
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+    return RedisBucketStore(fakeredis.FakeRedis())
+
+
+@pytest.fixture(params=[memory_store, redis_store], ids=["memory", "redis"])
+def store(request):
+    return request.param()
+
+
+def test_parse_limit():
+    assert parse_limit("5/60") == (5 / 60, 5)
+    with pytest.raises(ValueError):
+        parse_limit("0/60")
+
+
+def test_bucket_allows_burst_then_refills(store, clock):
+    rate, capacity = parse_limit("2/10")
+    assert store.take("k", rate, capacity) == (True, 0.0)
+    assert store.take("k", rate, capacity) == (True, 0.0)
+    allowed, retry_after = store.take("k", rate, capacity)
+    assert not allowed
+    assert retry_after == pytest.approx(5.0)
+
+    clock.now += 5
+    assert store.take("k", rate, capacity)[0]
+    assert not store.take("k", rate, capacity)[0]
+
+
+def test_cost_zero_checks_without_spending(store, clock):
+    rate, capacity = parse_limit("1/60")
+    assert store.take("k", rate, capacity, 0) == (True, 0.0)
+    assert store.take("k", rate, capacity, 0) == (True, 0.0)
+    assert store.take("k", rate, capacity)[0]
+    allowed, retry_after = store.take("k", rate, capacity, 0)
+    assert not allowed
+    assert retry_after == pytest.approx(60.0)
+
+
+def test_keys_are_independent(store, clock):
+    rate, capacity = parse_limit("1/60")
+    assert store.take("a", rate, capacity)[0]
+    assert not store.take("a", rate, capacity)[0]
+    assert store.take("b", rate, capacity)[0]
+
+
+def test_rate_limiter_hit(store, clock):
+    limiter = RateLimiter(store, {"login": "1/30", "off": ""})
+    assert limiter.hit("login", "alice") == 0
+    assert limiter.hit("login", "alice") == 30
+    assert limiter.hit("login", None) == 0
+    assert limiter.hit("off", "alice") == 0
+    assert limiter.hit("unknown", "alice") == 0
+
+
+def test_prune_uses_each_buckets_own_limit(clock):
+    store = MemoryBucketStore(max_keys=4)
+    slow, fast = parse_limit("2/300"), parse_limit("100/1")
+    assert store.take("register_ip:1", *slow)[0]
+    assert store.take("register_ip:1", *slow)[0]
+    clock.now += 1
+    # Overflow the store through a fast-refilling limit.
+    for user in range(3):
+        store.take(f"login_user:{user}", *fast)
+    clock.now += 1
+    store.take("login_user:x", *fast)
+    assert not store.take("register_ip:1", *slow)[0]
+
+
+def test_prune_is_bounded(clock):
+    store = MemoryBucketStore(max_keys=100, prune_batch=4)
+    rate, capacity = parse_limit("1/3600")
+    for key in range(1000):
+        store.take(str(key), rate, capacity)
+        assert len(store._buckets) <= 100
+    # Drained buckets that were evicted come back full, oldest first.
+    assert store.take("999", rate, capacity)[0] is False
+    assert store.take("0", rate, capacity)[0] is True
+
+
+def test_prune_drops_refilled_buckets_first(clock):
+    store = MemoryBucketStore(max_keys=3, prune_batch=8)
+    slow, fast = parse_limit("1/3600"), parse_limit("10/1")
+    store.take("fast", *fast)
+    store.take("slow1", *slow)
+    store.take("slow2", *slow)
+    clock.now += 1
+    store.take("slow3", *slow)
+    assert "fast" not in store._buckets
+    assert {"slow1", "slow2", "slow3"} <= set(store._buckets)
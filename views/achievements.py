@@ -0,0 +1,29 @@
+from flask import Blueprint, jsonify
+
+from extensions import achievement_rules, db
+from models import UserAchievement
+from views.common import read_only
+
+bp = Blueprint('achievements', __name__)
+
+def achievement_json(achievement, unlocked_at=None):
+    record = {"key": achievement.key, "name": achievement.name, "description": achievement.description}
+    if unlocked_at is not None:
+        record["unlocked_at"] = unlocked_at.strftime("%Y-%m-%d %H:%M:%S")
+    return record
+
+@bp.route('/achievements', methods=['GET'])
+def list_achievements():
+    return jsonify([achievement_json(a) for a in achievement_rules.by_key.values()]), 200
+
+@bp.route('/achievements/users/<int:user_id>', methods=['GET'])
+@read_only
+def user_achievements(user_id):
+    rows = db.session.execute(
+        db.select(UserAchievement.achievement, UserAchievement.unlocked_at)
+        .where(UserAchievement.user_id == user_id)
+        .order_by(UserAchievement.unlocked_at)
+    )
+    unlocked = [achievement_json(achievement_rules.by_key[key], unlocked_at)
+                for key, unlocked_at in rows if key in achievement_rules.by_key]
+    return jsonify({"user_id": user_id, "achievements": unlocked}), 200
@@ -0,0 +1,63 @@
+from flask import Blueprint, jsonify, request
+from flask_jwt_extended import jwt_required
+
+from checkins import metric_minutes_since
+from extensions import db
+from models import Event, MetricCounter
+
+bp = Blueprint('admin', __name__)
+
+# ================================
+# ADMIN METRICS
+# ================================
+
+@bp.route('/admin/metrics', methods=['GET'])
+@jwt_required()
+def admin_metrics():
+    limit = request.args.get('limit', 20, type=int)
+    limit = max(1, min(limit, 500))
+    since = metric_minutes_since().strftime("%Y-%m-%d %H:%M")
+
+    # Counters are sharded; sum the rows of each.
+    value = db.func.sum(MetricCounter.value)
+    totals = dict(db.session.execute(
+        db.select(MetricCounter.key, value).where(MetricCounter.kind == "total").group_by(MetricCounter.key)
+    ).all())
+    attendance = db.session.execute(
+        db.select(MetricCounter.key, value, Event.name)
+        .join(Event, Event.id == db.cast(MetricCounter.key, db.Integer))
+        .where(MetricCounter.kind == "event")
+        .group_by(MetricCounter.key, Event.name)
+        .order_by(value.desc())
+        .limit(limit)
+    ).all()
+    per_minute = db.session.execute(
+        db.select(MetricCounter.key, value)
+        .where(MetricCounter.kind == "minute", MetricCounter.key >= since)
+        .group_by(MetricCounter.key)
+        .order_by(MetricCounter.key)
+    ).all()
+    updated_at = db.session.scalar(db.select(db.func.max(MetricCounter.updated_at)))
+
+    return jsonify({
+        "total_users": totals.get("users", 0),
+        "total_events": totals.get("events", 0),
+        "total_checkins": totals.get("checkins", 0),
+        "unique_participants": totals.get("participants", 0),
+        "event_attendance": [{"event_id": int(key), "name": name, "checkins": value}
+                             for key, value, name in attendance],
+        "checkins_per_minute": [{"minute": key, "checkins": value} for key, value in per_minute],
+        "updated_at": updated_at.strftime("%Y-%m-%d %H:%M:%S") if updated_at else None,
+    }), 200
+
+# ================================
+# CONNECTION POOL METRICS
+# ================================
+
+@bp.route('/admin/pool', methods=['GET'])
+@jwt_required()
+def pool_metrics():
+    pool = db.engine.pool
+    if not hasattr(pool, 'status_snapshot'):
+        return jsonify({"pool_class": type(pool).__name__, "status": pool.status()}), 200
+    return jsonify(pool.status_snapshot()), 200
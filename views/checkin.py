@@ -0,0 +1,262 @@
+import csv
+import hmac
+import io
+import json
+from datetime import datetime, timezone
+from functools import wraps
+
+from flask import Blueprint, Response, current_app, jsonify, request, stream_with_context
+from flask_jwt_extended import get_jwt_identity, jwt_required
+from sqlalchemy.exc import IntegrityError
+
+from checkins import checkins_committed, record_checkins
+from extensions import checkin_tokens, db
+from models import CheckIn, Event, User, conflict_insert
+from views.common import read_only
+
+bp = Blueprint('checkin', __name__)
+
+def parse_event_id(value):
+    """Event id as an int; QR payloads carry it as a query-string value, so digit strings count."""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str) and value.strip().isdecimal():
+        return int(value)
+    return None
+
+@bp.route('/checkin', methods=['POST'])
+@jwt_required()
+def checkin():
+    current_user = int(get_jwt_identity())
+    event_id = request.json.get('event_id')
+    token = request.json.get('token')
+    if token is not None and checkin_tokens:
+        return checkin_with_token(current_user, event_id, token)
+    event_id = parse_event_id(event_id)
+    if event_id is None:
+        return jsonify({"error": "Event not found"}), 404
+
+    # One round trip: the INSERT only selects a row if the event exists, and
+    # the unique (user_id, event_id) index turns a repeat scan into a no-op.
+    now = datetime.utcnow()
+    source = db.select(db.literal(current_user), Event.id, db.literal(now)).where(Event.id == event_id)
+    stmt = (
+        conflict_insert(CheckIn)
+        .from_select(['user_id', 'event_id', 'timestamp'], source)
+        .on_conflict_do_nothing(index_elements=['user_id', 'event_id'])
+        .returning(CheckIn.id)
+    )
+    inserted = db.session.execute(stmt).scalar()
+    if inserted is not None:
+        record_checkins([(current_user, event_id, now)])
+    db.session.commit()
+    if inserted is not None:
+        checkins_committed([(current_user, event_id, now)])
+
+    if inserted is None:
+        if db.session.get(Event, event_id) is None:
+            return jsonify({"error": "Event not found"}), 404
+        return jsonify({"message": "You are already checked in!"}), 200
+
+    return jsonify({"message": "Check-in successful!"}), 201
+
+def checkin_with_token(user_id, event_id, token):
+    """Check in from a signed QR token, so a photo of an old code stops working once it expires."""
+    token_event_id = checkin_tokens.verify(token)
+    if token_event_id is None:
+        return jsonify({"error": "Invalid or expired check-in token"}), 403
+    if event_id is not None and parse_event_id(event_id) != token_event_id:
+        return jsonify({"error": "Token does not match event"}), 400
+
+    now = datetime.utcnow()
+    stmt = (
+        conflict_insert(CheckIn)
+        .values(user_id=user_id, event_id=token_event_id, timestamp=now)
+        .on_conflict_do_nothing(index_elements=['user_id', 'event_id'])
+        .returning(CheckIn.id)
+    )
+    try:
+        inserted = db.session.execute(stmt).scalar()
+    except IntegrityError:
+        # The event was deleted after the token was issued.
+        db.session.rollback()
+        return jsonify({"error": "Event not found"}), 404
+    if inserted is not None:
+        record_checkins([(user_id, token_event_id, now)])
+    db.session.commit()
+    if inserted is None:
+        return jsonify({"message": "You are already checked in!"}), 200
+
+    checkins_committed([(user_id, token_event_id, now)])
+    return jsonify({"message": "Check-in successful!"}), 201
+
+def parse_scan(record):
+    """Validate one offline scan record; returns ``((user_id, event_id, scanned_at), error)``."""
+    if not isinstance(record, dict):
+        return None, "Record must be an object"
+    user_id, event_id = record.get("user_id"), record.get("event_id")
+    # bool is an int subclass, but true/false are not ids.
+    if any(not isinstance(value, int) or isinstance(value, bool) for value in (user_id, event_id)):
+        return None, "user_id and event_id must be integers"
+    try:
+        scanned_at = datetime.fromisoformat(record["scanned_at"])
+    except (KeyError, TypeError, ValueError):
+        return None, "scanned_at must be an ISO date, e.g. YYYY-MM-DD HH:MM:SS"
+    if scanned_at.tzinfo is not None:
+        scanned_at = scanned_at.astimezone(timezone.utc).replace(tzinfo=None)
+    return (user_id, event_id, scanned_at), None
+
+def scanner_required(view):
+    """Require a configured scanner key in X-Scanner-Key; batch ingestion checks in other users."""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        key = request.headers.get('X-Scanner-Key', '')
+        if not any(hmac.compare_digest(key, allowed) for allowed in current_app.config['SCANNER_API_KEYS']):
+            return jsonify({"error": "A valid scanner key is required"}), 403
+        return view(*args, **kwargs)
+    return wrapper
+
+@bp.route('/checkin/batch', methods=['POST'])
+@jwt_required()
+@scanner_required
+def checkin_batch():
+    records = (request.json or {}).get("checkins")
+    if not isinstance(records, list) or not records:
+        return jsonify({"error": "checkins must be a non-empty list"}), 400
+    if len(records) > current_app.config['CHECKIN_BATCH_MAX']:
+        return jsonify({"error": f"At most {current_app.config['CHECKIN_BATCH_MAX']} check-ins per batch"}), 400
+
+    results = [None] * len(records)
+    scans = {}
+    for index, record in enumerate(records):
+        scan, error = parse_scan(record)
+        if error:
+            results[index] = {"index": index, "status": "invalid", "error": error}
+        else:
+            scans[index] = scan
+
+    user_ids = {user_id for user_id, _, _ in scans.values()}
+    event_ids = {event_id for _, event_id, _ in scans.values()}
+    known_users = set(db.session.scalars(db.select(User.id).where(User.id.in_(user_ids)))) if user_ids else set()
+    known_events = set(db.session.scalars(db.select(Event.id).where(Event.id.in_(event_ids)))) if event_ids else set()
+
+    # Earliest scan of each (user, event) pair wins; later ones are duplicates.
+    first_scan = {}
+    for index, (user_id, event_id, scanned_at) in sorted(scans.items(), key=lambda item: item[1][2]):
+        if user_id not in known_users or event_id not in known_events:
+            results[index] = {"index": index, "status": "not_found", "error": "Unknown user or event"}
+        elif (user_id, event_id) in first_scan:
+            results[index] = {"index": index, "status": "duplicate"}
+        else:
+            first_scan[(user_id, event_id)] = index
+
+    rows = [{"user_id": user_id, "event_id": event_id, "timestamp": scans[index][2]}
+            for (user_id, event_id), index in sorted(first_scan.items())]
+    created = set()
+    chunk = current_app.config['CHECKIN_INSERT_CHUNK']
+    for start in range(0, len(rows), chunk):
+        stmt = (
+            conflict_insert(CheckIn)
+            .values(rows[start:start + chunk])
+            .on_conflict_do_nothing(index_elements=['user_id', 'event_id'])
+            .returning(CheckIn.user_id, CheckIn.event_id)
+        )
+        created.update(tuple(row) for row in db.session.execute(stmt))
+    new_checkins = [(user_id, event_id, scans[first_scan[(user_id, event_id)]][2])
+                    for user_id, event_id in created]
+    record_checkins(new_checkins)
+    db.session.commit()
+    checkins_committed(new_checkins)
+
+    for pair, index in first_scan.items():
+        results[index] = {"index": index, "status": "created" if pair in created else "duplicate"}
+
+    summary = {}
+    for result in results:
+        summary[result["status"]] = summary.get(result["status"], 0) + 1
+    return jsonify({"summary": summary, "results": results}), 200
+
+@bp.route('/event_attendees/<int:event_id>', methods=['GET'])
+@read_only
+def event_attendees(event_id):
+    after_id = request.args.get('after_id', 0, type=int)
+    limit = request.args.get('limit', current_app.config['ATTENDEES_PAGE_SIZE'], type=int)
+    limit = max(1, min(limit, current_app.config['ATTENDEES_PAGE_MAX']))
+
+    # Keyset page over the (event_id, user_id) index; one extra row tells us
+    # whether another page exists.
+    rows = db.session.execute(
+        db.select(CheckIn.user_id, User.username)
+        .join(User, User.id == CheckIn.user_id)
+        .where(CheckIn.event_id == event_id, CheckIn.user_id > after_id)
+        .order_by(CheckIn.user_id)
+        .limit(limit + 1)
+    ).all()
+
+    attendees = [{"user_id": user_id, "username": username} for user_id, username in rows[:limit]]
+    next_after_id = attendees[-1]["user_id"] if len(rows) > limit else None
+
+    return jsonify({"event_id": event_id, "attendees": attendees, "next_after_id": next_after_id})
+
+def export_ndjson(rows, chunk):
+    lines = []
+    for count, (user_id, username, timestamp) in enumerate(rows):
+        record = {"user_id": user_id, "username": username,
+                  "checked_in_at": timestamp.strftime("%Y-%m-%d %H:%M:%S") if timestamp else None}
+        lines.append(json.dumps(record) + "\n")
+        # Flush the first record right away so the download starts immediately.
+        if count == 0 or len(lines) >= chunk:
+            yield "".join(lines)
+            lines.clear()
+    yield "".join(lines)
+
+def export_csv(rows, chunk):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(["user_id", "username", "checked_in_at"])
+    yield buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+
+    for count, (user_id, username, timestamp) in enumerate(rows, 1):
+        writer.writerow([user_id, username, timestamp.strftime("%Y-%m-%d %H:%M:%S") if timestamp else ""])
+        if count % chunk == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+EXPORT_FORMATS = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+@bp.route('/event_attendees/<int:event_id>/export', methods=['GET'])
+def export_event_attendees(event_id):
+    output = request.args.get('format', 'ndjson')
+    if output not in EXPORT_FORMATS:
+        return jsonify({"error": "format must be 'ndjson' or 'csv'"}), 400
+
+    chunk = current_app.config['ATTENDEES_EXPORT_CHUNK']
+    stmt = (
+        db.select(CheckIn.user_id, User.username, CheckIn.timestamp)
+        .join(User, User.id == CheckIn.user_id)
+        .where(CheckIn.event_id == event_id)
+        .order_by(CheckIn.user_id)
+        .execution_options(yield_per=chunk)
+    )
+
+    def generate():
+        # yield_per streams from a server-side cursor, so memory stays flat
+        # no matter how many attendees the event has.
+        rows = db.session.execute(stmt)
+        try:
+            if output == "csv":
+                yield from export_csv(rows, chunk)
+            else:
+                yield from export_ndjson(rows, chunk)
+        finally:
+            rows.close()
+
+    filename = f"event_{event_id}_attendees.{output}"
+    return Response(stream_with_context(generate()), mimetype=EXPORT_FORMATS[output],
+                    headers={"Content-Disposition": f"attachment; filename={filename}"})
@@ -0,0 +1,65 @@
+import hashlib
+from functools import wraps
+
+from flask import current_app, g, request
+from sqlalchemy.exc import OperationalError
+
+from extensions import db, replica_set
+
+# ================================
+# HTTP CACHING
+# ================================
+
+def make_etag(*parts):
+    digest = hashlib.sha256("|".join(str(p) for p in parts).encode("utf-8"))
+    return digest.hexdigest()[:32]
+
+def with_cache_headers(response, etag, cache_control):
+    response.set_etag(etag)
+    if cache_control:
+        response.headers['Cache-Control'] = cache_control
+    return response
+
+def not_modified(etag, cache_control):
+    """Return a 304 response if the request's If-None-Match matches ``etag``."""
+    if request.if_none_match.contains(etag):
+        return with_cache_headers(current_app.response_class(status=304), etag, cache_control)
+    return None
+
+# ================================
+# READ REPLICA ROUTING
+# ================================
+
+PRIMARY_COOKIE = "tz_read_primary"
+
+def wants_primary():
+    # Read-your-writes: clients that just wrote stay on the primary for a while.
+    return request.cookies.get(PRIMARY_COOKIE) or request.headers.get("X-Read-Consistency") == "primary"
+
+def read_only(view):
+    """Route the view's SELECTs to a healthy replica, retrying once on the primary if it fails."""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if not replica_set or wants_primary():
+            return view(*args, **kwargs)
+        key = replica_set.choose(db.engines)
+        if key is None:
+            return view(*args, **kwargs)
+
+        g.db_replica = key
+        try:
+            return view(*args, **kwargs)
+        except OperationalError:
+            db.session.rollback()
+            replica_set.mark_down(key)
+            g.db_replica = None
+            return view(*args, **kwargs)
+        finally:
+            g.pop('db_replica', None)
+    return wrapper
+
+def stick_to_primary_after_write(response):
+    if replica_set and request.method not in ("GET", "HEAD", "OPTIONS") and response.status_code < 400:
+        response.set_cookie(PRIMARY_COOKIE, "1", max_age=current_app.config['REPLICA_STICKY_SECONDS'],
+                            httponly=True, samesite="Lax")
+    return response
@@ -0,0 +1,132 @@
+import base64
+from datetime import datetime
+
+from flask import Blueprint, current_app, jsonify, request
+from flask_jwt_extended import jwt_required
+
+from extensions import db
+from models import Event
+from views.common import make_etag, not_modified, read_only, with_cache_headers
+
+bp = Blueprint('events', __name__)
+
+@bp.route('/events', methods=['POST'])
+@jwt_required()
+def create_event():
+    data = request.json
+    if not all(k in data for k in ("name", "date")):
+        return jsonify({"error": "Missing required fields"}), 400
+
+    try:
+        event_date = datetime.strptime(data["date"], "%Y-%m-%d %H:%M:%S")
+    except ValueError:
+        return jsonify({"error": "Invalid date format. Use YYYY-MM-DD HH:MM:SS"}), 400
+
+    new_event = Event(name=data["name"], date=event_date)
+    db.session.add(new_event)
+    db.session.commit()
+
+    return jsonify({"message": "Event created successfully!", "event_id": new_event.id}), 201
+
+EVENT_FIELDS = ("id", "name", "date")
+
+def encode_event_cursor(date, event_id):
+    raw = f"{date.isoformat()}|{event_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+def decode_event_cursor(cursor):
+    try:
+        date, event_id = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8").split("|")
+        return datetime.fromisoformat(date), int(event_id)
+    except (ValueError, UnicodeError):
+        return None
+
+def event_filters(args):
+    """Build WHERE clauses from when/from/to query parameters; returns ``(filters, error)``."""
+    filters = []
+    when = args.get('when')
+    if when == 'upcoming':
+        filters.append(Event.date >= datetime.now())
+    elif when == 'past':
+        filters.append(Event.date < datetime.now())
+    elif when is not None:
+        return None, "when must be 'upcoming' or 'past'"
+
+    for name, compare in (('from', Event.date.__ge__), ('to', Event.date.__le__)):
+        value = args.get(name)
+        if value is None:
+            continue
+        try:
+            filters.append(compare(datetime.fromisoformat(value)))
+        except ValueError:
+            return None, f"Invalid '{name}' date. Use YYYY-MM-DD HH:MM:SS"
+    return filters, None
+
+@bp.route('/events', methods=['GET'])
+@read_only
+def get_events():
+    filters, error = event_filters(request.args)
+    if error:
+        return jsonify({"error": error}), 400
+
+    fields = request.args.get('fields', ",".join(EVENT_FIELDS)).split(",")
+    if not fields or any(field not in EVENT_FIELDS for field in fields):
+        return jsonify({"error": f"fields must be a comma-separated subset of {', '.join(EVENT_FIELDS)}"}), 400
+
+    descending = request.args.get('order', 'asc') == 'desc'
+    limit = request.args.get('limit', current_app.config['EVENTS_PAGE_SIZE'], type=int)
+    limit = max(1, min(limit, current_app.config['EVENTS_PAGE_MAX']))
+
+    stmt = db.select(Event.id, Event.date, Event.updated_at,
+                     *(getattr(Event, field) for field in fields if field not in ("id", "date")))
+    cursor = request.args.get('cursor')
+    if cursor:
+        position = decode_event_cursor(cursor)
+        if position is None:
+            return jsonify({"error": "Invalid cursor"}), 400
+        key = db.tuple_(Event.date, Event.id)
+        filters.append(key < position if descending else key > position)
+    if descending:
+        stmt = stmt.order_by(Event.date.desc(), Event.id.desc())
+    else:
+        stmt = stmt.order_by(Event.date, Event.id)
+    rows = db.session.execute(stmt.where(*filters).limit(limit + 1)).all()
+
+    # Validated against this page only, so a revalidation costs the same
+    # bounded index scan as the page itself instead of an aggregate over
+    # every matching event.
+    cache_control = current_app.config['EVENTS_CACHE_CONTROL']
+    etag = make_etag("events", request.query_string, len(rows) > limit,
+                     *((row.id, row.updated_at) for row in rows[:limit]))
+    cached = not_modified(etag, cache_control)
+    if cached:
+        return cached
+
+    events_list = []
+    for row in rows[:limit]:
+        record = row._asdict()
+        if "date" in fields:
+            record["date"] = row.date.strftime("%Y-%m-%d %H:%M:%S")
+        events_list.append({field: record[field] for field in fields})
+
+    response = with_cache_headers(jsonify(events_list), etag, cache_control)
+    if len(rows) > limit:
+        last = rows[limit - 1]
+        response.headers['X-Next-Cursor'] = encode_event_cursor(last.date, last.id)
+    return response, 200
+
+@bp.route('/events/<int:event_id>', methods=['GET'])
+@read_only
+def get_event(event_id):
+    event = Event.query.get(event_id)
+    if not event:
+        return jsonify({"error": "Event not found"}), 404
+
+    cache_control = current_app.config['EVENTS_CACHE_CONTROL']
+    etag = make_etag("event", event.id, event.updated_at)
+    cached = not_modified(etag, cache_control)
+    if cached:
+        return cached
+
+    response = jsonify({"id": event.id, "name": event.name, "date": event.date.strftime("%Y-%m-%d %H:%M:%S")})
+    return with_cache_headers(response, etag, cache_control), 200
@@ -0,0 +1,102 @@
+from datetime import datetime
+
+from flask import Blueprint, current_app, jsonify, request
+
+from checkins import LEADERBOARD_PERIODS, leaderboard_period_key, lookup_usernames
+from extensions import db, leaderboard_store
+from models import LeaderboardScore, User
+from views.common import read_only
+
+bp = Blueprint('leaderboard', __name__)
+
+def load_leaderboard_store():
+    """(Re)build the store from leaderboard_score for the current periods when it asks for it."""
+    app = current_app._get_current_object()
+
+    def load():
+        # May run in the store's reload thread, outside this request.
+        with app.app_context():
+            now = datetime.utcnow()
+            boards = {leaderboard_period_key(period, now): {} for period in LEADERBOARD_PERIODS}
+            rows = db.session.execute(
+                db.select(LeaderboardScore.period, LeaderboardScore.user_id, LeaderboardScore.checkins)
+                .where(LeaderboardScore.period.in_(boards))
+            )
+            for period, user_id, checkins in rows:
+                boards[period][user_id] = checkins
+            return boards
+
+    leaderboard_store.refresh(load)
+
+def leaderboard_top(period_key, limit):
+    """Return ``[(user_id, username, checkins)]`` for the top ``limit`` users."""
+    if leaderboard_store is not None:
+        load_leaderboard_store()
+        top = leaderboard_store.top(period_key, limit)
+        names = lookup_usernames([user_id for user_id, _ in top])
+        return [(user_id, names[user_id], checkins) for user_id, checkins in top]
+
+    # Served straight off the (period, checkins, user_id) index.
+    return db.session.execute(
+        db.select(LeaderboardScore.user_id, User.username, LeaderboardScore.checkins)
+        .join(User, User.id == LeaderboardScore.user_id)
+        .where(LeaderboardScore.period == period_key)
+        .order_by(LeaderboardScore.checkins.desc(), LeaderboardScore.user_id)
+        .limit(limit)
+    ).all()
+
+def leaderboard_user_rank(period_key, user_id):
+    """Return ``(rank, checkins)`` for ``user_id``."""
+    if leaderboard_store is not None:
+        load_leaderboard_store()
+        return leaderboard_store.rank(period_key, user_id)
+
+    checkins = db.session.scalar(
+        db.select(LeaderboardScore.checkins)
+        .where(LeaderboardScore.period == period_key, LeaderboardScore.user_id == user_id)
+    ) or 0
+    ahead = db.session.scalar(
+        db.select(db.func.count())
+        .select_from(LeaderboardScore)
+        .where(LeaderboardScore.period == period_key, LeaderboardScore.checkins > checkins)
+    )
+    return ahead + 1, checkins
+
+def leaderboard_period_arg():
+    period = request.args.get('period', 'all')
+    if period not in LEADERBOARD_PERIODS:
+        return None
+    return leaderboard_period_key(period, datetime.utcnow())
+
+@bp.route('/leaderboard', methods=['GET'])
+@read_only
+def leaderboard():
+    period_key = leaderboard_period_arg()
+    if period_key is None:
+        return jsonify({"error": "period must be 'all', 'week' or 'month'"}), 400
+    limit = request.args.get('limit', 10, type=int)
+    limit = max(1, min(limit, current_app.config['LEADERBOARD_MAX']))
+
+    rows = leaderboard_top(period_key, limit)
+
+    points_per_checkin = current_app.config['POINTS_PER_CHECKIN']
+    leaders = []
+    for position, (user_id, username, checkins) in enumerate(rows, 1):
+        # Competition ranking: tied users share the better rank.
+        rank = leaders[-1]["rank"] if leaders and leaders[-1]["checkins"] == checkins else position
+        leaders.append({"rank": rank, "user_id": user_id, "username": username,
+                        "checkins": checkins, "points": checkins * points_per_checkin})
+
+    return jsonify({"period": period_key, "leaders": leaders}), 200
+
+@bp.route('/leaderboard/users/<int:user_id>', methods=['GET'])
+@read_only
+def leaderboard_rank(user_id):
+    period_key = leaderboard_period_arg()
+    if period_key is None:
+        return jsonify({"error": "period must be 'all', 'week' or 'month'"}), 400
+
+    rank, checkins = leaderboard_user_rank(period_key, user_id)
+
+    return jsonify({"period": period_key, "user_id": user_id, "rank": rank,
+                    "checkins": checkins, "points": checkins * current_app.config['POINTS_PER_CHECKIN']}), 200
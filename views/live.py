@@ -0,0 +1,51 @@
+import threading
+
+from flask import Blueprint, Response, current_app, jsonify, stream_with_context
+
+from checkins import live_bridge_enabled, lookup_usernames
+from extensions import db, live_broker
+from live_feed import PostgresNotifyBridge, format_sse, sse_stream
+from models import Event
+
+bp = Blueprint('live', __name__)
+
+live_bridge = None
+live_bridge_lock = threading.Lock()
+
+def ensure_live_bridge():
+    """Start this worker's LISTEN thread on first subscription (i.e. after fork)."""
+    global live_bridge
+    if live_bridge is not None or not live_bridge_enabled():
+        return
+    engine = db.engine
+
+    def connect():
+        conn = engine.raw_connection()
+        # Take the driver connection first; detaching clears it from the proxy.
+        driver_connection = conn.driver_connection
+        conn.detach()
+        return driver_connection
+
+    with live_bridge_lock:
+        if live_bridge is None:
+            live_bridge = PostgresNotifyBridge(connect, current_app.config['LIVE_FEED_CHANNEL'], live_broker)
+            live_bridge.start()
+
+@bp.route('/events/<int:event_id>/live', methods=['GET'])
+def event_live_feed(event_id):
+    if db.session.get(Event, event_id) is None:
+        return jsonify({"error": "Event not found"}), 404
+
+    ensure_live_bridge()
+    subscription = live_broker.subscribe(event_id, maxsize=current_app.config['LIVE_FEED_QUEUE'])
+    db.session.remove()
+
+    def render(message):
+        username = lookup_usernames([message["user_id"]])[message["user_id"]]
+        # Don't hold a pooled connection for the lifetime of the stream.
+        db.session.remove()
+        return format_sse(dict(message, username=username), event="checkin")
+
+    stream = sse_stream(subscription, render, heartbeat=current_app.config['LIVE_FEED_HEARTBEAT'])
+    return Response(stream_with_context(stream), mimetype='text/event-stream',
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
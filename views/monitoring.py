@@ -0,0 +1,106 @@
+import time
+
+from flask import Blueprint, Response, g, has_request_context, jsonify, request
+from flask_jwt_extended import jwt_required
+from sqlalchemy.engine import Engine
+
+from extensions import db, metrics
+from sql_profiler import QueryProfiler, RequestProfile
+
+bp = Blueprint('monitoring', __name__)
+
+# ================================
+# REQUEST METRICS
+# ================================
+
+metrics.histogram("trakzone_http_request_duration_seconds", "Time spent in the view, by endpoint.")
+metrics.counter("trakzone_http_requests_total", "Requests handled, by endpoint and status.")
+metrics.histogram("trakzone_db_query_duration_seconds", "SQL statement execution time, by endpoint.")
+metrics.counter("trakzone_db_queries_total", "SQL statements executed, by endpoint.")
+metrics.histogram("trakzone_qr_render_seconds", "QR image render time on cache misses.")
+metrics.histogram("trakzone_password_hash_seconds", "Password hash and verify time.")
+
+def metrics_endpoint():
+    if not has_request_context():
+        return "none"
+    return request.endpoint or "unmatched"
+
+@bp.before_app_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+@bp.after_app_request
+def record_request_metrics(response):
+    started = g.pop('request_started', None)
+    if started is not None:
+        endpoint = metrics_endpoint()
+        metrics.observe("trakzone_http_request_duration_seconds", time.perf_counter() - started,
+                        endpoint=endpoint, method=request.method)
+        metrics.inc("trakzone_http_requests_total", endpoint=endpoint, method=request.method,
+                    status=response.status_code)
+    return response
+
+@db.event.listens_for(Engine, 'before_cursor_execute')
+def start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    context.query_started = time.perf_counter()
+
+@db.event.listens_for(Engine, 'after_cursor_execute')
+def record_query_metrics(conn, cursor, statement, parameters, context, executemany):
+    endpoint = metrics_endpoint()
+    metrics.observe("trakzone_db_query_duration_seconds", time.perf_counter() - context.query_started,
+                    endpoint=endpoint)
+    metrics.inc("trakzone_db_queries_total", endpoint=endpoint)
+
+@bp.route('/metrics', methods=['GET'])
+def prometheus_metrics():
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+# ================================
+# SQL PROFILER
+# ================================
+
+sql_profiler = None
+
+def start_sql_profile():
+    g.sql_profile = RequestProfile()
+
+def start_profiled_query(conn, cursor, statement, parameters, context, executemany):
+    sql_profiler.before_execute(context)
+
+def profile_query(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context() and g.get('sql_profile') is not None:
+        sql_profiler.after_execute(g.sql_profile, conn, cursor, statement, parameters, context, executemany)
+
+def finish_sql_profile(response):
+    profile = g.pop('sql_profile', None)
+    if profile is not None:
+        summary = sql_profiler.finish(profile, request.method, request.path, metrics_endpoint())
+        response.headers['X-SQL-Queries'] = str(summary["queries"])
+        response.headers['X-SQL-Time-Ms'] = str(summary["duration_ms"])
+        if summary["repeated"]:
+            response.headers['X-SQL-Repeated'] = "; ".join(
+                f'{repeated["count"]}x {repeated["statement"][:120]}' for repeated in summary["repeated"])
+    return response
+
+@jwt_required()
+def sql_profile_report():
+    return jsonify(sql_profiler.report()), 200
+
+def init_sql_profiler(app):
+    """Hook the profiler into ``app`` when SQL_PROFILER is set."""
+    global sql_profiler
+    if not app.config['SQL_PROFILER']:
+        return
+    if sql_profiler is None:
+        sql_profiler = QueryProfiler(
+            slow_ms=app.config['SQL_PROFILER_SLOW_MS'],
+            explain=app.config['SQL_PROFILER_EXPLAIN'],
+            repeat_threshold=app.config['SQL_PROFILER_REPEAT_THRESHOLD'],
+            report_size=app.config['SQL_PROFILER_REPORT_SIZE'],
+        )
+        db.event.listen(Engine, 'before_cursor_execute', start_profiled_query)
+        db.event.listen(Engine, 'after_cursor_execute', profile_query)
+
+    app.before_request(start_sql_profile)
+    app.after_request(finish_sql_profile)
+    app.add_url_rule('/admin/sql-profile', view_func=sql_profile_report, methods=['GET'])
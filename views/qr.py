@@ -0,0 +1,130 @@
+import io
+from functools import partial
+
+from flask import Blueprint, Response, current_app, jsonify, request, send_file
+from flask_jwt_extended import jwt_required
+
+from extensions import checkin_tokens, db, metrics, qr_cache
+from models import Event
+from qr_render import (DEFAULT_OPTIONS, ERROR_CORRECTION, FORMATS, options_variant, render,
+                       render_many, sprite_sheet, stream_zip)
+from views.common import not_modified, with_cache_headers
+
+bp = Blueprint('qr', __name__)
+
+def event_qr_payload(event_id):
+    api_url = current_app.config['API_URL']
+    if checkin_tokens:
+        return f"{api_url}/checkin?event_id={event_id}&token={checkin_tokens.issue(event_id)}"
+    return f"{api_url}/checkin?event_id={event_id}"
+
+@db.event.listens_for(Event, 'after_delete')
+def _invalidate_event_qr(mapper, connection, target):
+    qr_cache.invalidate(event_qr_payload(target.id))
+
+def parse_qr_options(args):
+    """Read format/size/border/ec query parameters; returns ``(options, error)``."""
+    options = dict(DEFAULT_OPTIONS)
+    options["format"] = args.get("format", options["format"]).lower()
+    if options["format"] not in FORMATS:
+        return None, "format must be 'png' or 'svg'"
+
+    options["error_correction"] = args.get("ec", options["error_correction"]).upper()
+    if options["error_correction"] not in ERROR_CORRECTION:
+        return None, "ec must be one of L, M, Q, H"
+
+    for name, key, low, high in (("size", "box_size", 1, 50), ("border", "border", 0, 20)):
+        value = args.get(name, options[key])
+        try:
+            value = int(value)
+        except ValueError:
+            value = None
+        if value is None or not low <= value <= high:
+            return None, f"{name} must be an integer between {low} and {high}"
+        options[key] = value
+
+    return options, None
+
+@bp.route('/generate_qr/<int:event_id>', methods=['GET'])
+def generate_event_qr(event_id):
+    event = Event.query.get(event_id)
+    if not event:
+        return jsonify({"error": "Event not found"}), 404
+
+    options, error = parse_qr_options(request.args)
+    if error:
+        return jsonify({"error": error}), 400
+
+    payload = event_qr_payload(event_id)
+    variant = options_variant(options)
+    cache_control = current_app.config['QR_CACHE_CONTROL']
+    if checkin_tokens and cache_control:
+        # Don't let clients hold on to an image whose token is about to rotate.
+        cache_control = f"public, max-age={checkin_tokens.seconds_until_rotation()}"
+    etag = qr_cache.key_for(payload, variant)
+    cached = not_modified(etag, cache_control)
+    if cached:
+        return cached
+
+    image = qr_cache.get_or_render(payload, partial(timed_render, **options), variant)
+    response = send_file(io.BytesIO(image), mimetype=FORMATS[options["format"]], etag=False)
+    return with_cache_headers(response, etag, cache_control)
+
+def timed_render(payload, **options):
+    with metrics.timer("trakzone_qr_render_seconds", format=options["format"]):
+        return render(payload, **options)
+
+def batch_qr_images(payloads, max_workers=None):
+    """Yield PNG bytes per payload, serving cache hits and rendering misses in the pool.
+
+    Runs while the ZIP streams, after the request context is gone, so it must
+    not touch ``current_app``.
+    """
+    cached = [qr_cache.get(payload) for payload in payloads]
+    missing = [payload for payload, png in zip(payloads, cached) if png is None]
+    rendered = render_many(missing, max_workers=max_workers)
+
+    for payload, png in zip(payloads, cached):
+        if png is None:
+            png = next(rendered)
+            qr_cache.put(payload, png)
+        yield png
+
+@bp.route('/generate_qr/batch', methods=['POST'])
+@jwt_required()
+def generate_event_qr_batch():
+    data = request.json or {}
+    event_ids = data.get("event_ids")
+    output = data.get("format", "zip")
+    if not isinstance(event_ids, list) or not event_ids:
+        return jsonify({"error": "event_ids must be a non-empty list"}), 400
+    if not all(isinstance(event_id, int) for event_id in event_ids):
+        return jsonify({"error": "event_ids must be integers"}), 400
+    if len(event_ids) > current_app.config['QR_BATCH_MAX']:
+        return jsonify({"error": f"At most {current_app.config['QR_BATCH_MAX']} events per batch"}), 400
+    if output not in ("zip", "sprite"):
+        return jsonify({"error": "format must be 'zip' or 'sprite'"}), 400
+    columns = data.get("columns")
+    if columns is not None and (not isinstance(columns, int) or columns < 1):
+        return jsonify({"error": "columns must be a positive integer"}), 400
+
+    event_ids = list(dict.fromkeys(event_ids))
+    found = {row.id for row in db.session.query(Event.id).filter(Event.id.in_(event_ids))}
+    missing = [event_id for event_id in event_ids if event_id not in found]
+    if missing:
+        return jsonify({"error": "Event not found", "missing": missing}), 404
+
+    payloads = [event_qr_payload(event_id) for event_id in event_ids]
+    images = batch_qr_images(payloads, max_workers=current_app.config['QR_BATCH_WORKERS'])
+
+    if output == "sprite":
+        png, columns, cell = sprite_sheet(list(images), columns=columns)
+        response = send_file(io.BytesIO(png), mimetype='image/png')
+        response.headers['X-Sprite-Columns'] = str(columns)
+        response.headers['X-Sprite-Cell-Size'] = str(cell)
+        response.headers['X-Sprite-Order'] = ",".join(str(event_id) for event_id in event_ids)
+        return response
+
+    named = ((f"event_{event_id}.png", png) for event_id, png in zip(event_ids, images))
+    return Response(stream_zip(named), mimetype='application/zip',
+                    headers={"Content-Disposition": "attachment; filename=event_qr_codes.zip"})